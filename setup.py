@@ -16,14 +16,16 @@ except FileNotFoundError:
     long_description = "Intelligent Model & Environment Manager for Tenstorrent Hardware"
 
 # Extract version from tt-jukebox.py
+_VER_RE = re.compile(r'[Vv]ersion:\s*([0-9]+\.[0-9]+\.[0-9]+)')
 version = "1.0.0"
 try:
     with open("tt-jukebox.py", "r", encoding="utf-8") as f:
-        content = f.read()
-        # Look for version string in the file
-        version_match = re.search(r'[Vv]ersion:\s*([0-9]+\.[0-9]+\.[0-9]+)', content)
-        if version_match:
-            version = version_match.group(1)
+        # The version lives in the module docstring; stop at the first hit
+        for line in f:
+            version_match = _VER_RE.search(line)
+            if version_match:
+                version = version_match.group(1)
+                break
 except FileNotFoundError:
     pass
 
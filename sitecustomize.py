@@ -16,20 +16,41 @@ How it works:
 3. This script registers TT models before any vLLM code runs
 4. Works in parent process AND all spawned subprocesses
 
+Registration only runs when TT_JUKEBOX_REGISTER_MODELS is set. start-vllm-server.py
+sets it before launching vLLM, so the server's workers inherit it while unrelated
+Python processes with tt-jukebox on PYTHONPATH skip the vLLM import probe entirely.
+
 See PEP 370 for details on sitecustomize.py mechanism.
 """
 
+import os
+
+
 def _register_tt_models():
     """Register TT models with vLLM's ModelRegistry."""
+    # Only processes launched by start-vllm-server.py need the registry
+    if not os.environ.get('TT_JUKEBOX_REGISTER_MODELS'):
+        return
+
     try:
-        # Only register if vLLM is available
-        from vllm import ModelRegistry
+        # Only register if vLLM is available. Import the registry from the
+        # submodule that defines it rather than `from vllm import ModelRegistry`,
+        # which resolves through vllm's top-level exports.
+        try:
+            from vllm.model_executor.models import ModelRegistry
+        except ImportError:
+            from vllm import ModelRegistry  # Older vLLM layouts
+
+        # Already registered in this process - nothing to do
+        if getattr(ModelRegistry, '_tt_registered', False):
+            return
 
         # Register TTLlamaForCausalLM (covers Llama, Qwen, Mistral, Gemma)
         ModelRegistry.register_model(
             "TTLlamaForCausalLM",
             "models.tt_transformers.tt.generator_vllm:LlamaForCausalLM"
         )
+        ModelRegistry._tt_registered = True
 
         # Silently succeed - don't print in subprocesses
         # Only parent process will see the print from start-vllm-server.py
@@ -10,12 +10,40 @@
 # - HF_MODEL: HuggingFace model identifier based on your --model path
 # - Hardware type: Runs tt-smi to detect N150/N300/T3K/P100/P150
 # - Environment variables: MESH_DEVICE, TT_METAL_ARCH_NAME, TT_METAL_HOME
+#
+# The detected board type is cached in ~/.cache/tt-jukebox/hw.json for 1 hour so
+# warm starts skip tt-smi. Pass --refresh-hw to re-detect (TT_JUKEBOX_HW_CACHE=1
+# trusts the cache regardless of age).
 
-import runpy
 import sys
 import os
-import json
+import re
+import shutil
 import subprocess
+import time
+
+# Hardware detection cache (see detect_and_configure_hardware)
+HW_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'tt-jukebox', 'hw.json')
+HW_CACHE_TTL = 3600  # 1 hour
+
+# First "board_type" value in raw tt-smi -s output (device_info[0])
+_BOARD_TYPE_RE = re.compile(rb'"board_type"\s*:\s*"([^"]+)"')
+
+# Model family keyword (found in the --model directory name) -> HuggingFace org
+_ORG_RE = re.compile(r'(qwen|gemma|llama|mistral)', re.IGNORECASE)
+_ORG_MAP = {
+    'qwen': 'Qwen',
+    'gemma': 'google',
+    'llama': 'meta-llama',
+    'mistral': 'mistralai',
+}
+
+# Sensible vLLM defaults injected by configure_from_argv() when not passed
+DEFAULTS = (
+    ('--max-model-len', '2048'),    # Good for development, prevents OOM
+    ('--max-num-seqs', '16'),       # Balanced for small models
+    ('--block-size', '64'),         # Standard KV cache block size
+)
 
 def register_tt_models():
     """
@@ -43,7 +71,10 @@ def register_tt_models():
     - Mistral family - uses Llama architecture
     - Any Llama-compatible architecture
     """
-    from vllm import ModelRegistry
+    try:
+        from vllm.model_executor.models import ModelRegistry
+    except ImportError:
+        from vllm import ModelRegistry  # Older vLLM layouts
 
     # Register Llama-based models for Tenstorrent hardware
     # Many models (Qwen, Mistral, etc.) use Llama architecture internally
@@ -69,7 +100,104 @@ def register_tt_models():
     print("✓ Supported: Llama, Gemma, Qwen, Mistral, and Llama-compatible architectures")
 
 
-def detect_and_configure_hardware():
+def load_hw_cache():
+    """
+    Return the cached hardware detection blob, or None if missing/stale.
+
+    The cache is fresh for HW_CACHE_TTL seconds; TT_JUKEBOX_HW_CACHE=1 trusts it
+    regardless of age.
+    """
+    import json
+
+    try:
+        with open(HW_CACHE_FILE, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(data, dict) or not data.get('board_type'):
+        return None
+
+    if os.environ.get('TT_JUKEBOX_HW_CACHE') != '1':
+        if time.time() - data.get('mtime', 0) > HW_CACHE_TTL:
+            return None
+
+    return data
+
+
+def save_hw_cache(board_type, tt_metal_home=None):
+    """
+    Persist a successful tt-smi detection so later starts can skip it.
+
+    tt_metal_home is only stored once the directory has been validated, so a
+    fresh cache entry lets the next start trust it without another stat.
+    """
+    import json
+
+    data = {'board_type': board_type, 'mtime': time.time()}
+    if tt_metal_home:
+        data['tt_metal_home'] = tt_metal_home
+    try:
+        os.makedirs(os.path.dirname(HW_CACHE_FILE), exist_ok=True)
+        with open(HW_CACHE_FILE, 'w') as f:
+            json.dump(data, f)
+    except OSError:
+        pass  # Cache is an optimization only
+
+
+def query_board_type(msgs):
+    """
+    Run tt-smi -s and return the first device's board_type (upper-cased).
+
+    Only board_type is needed, so the raw output is scanned with a regex; the
+    full JSON parse is a fallback for when the scan misses.
+
+    Appends a warning to msgs and returns None if the output has no usable board_type.
+    Subprocess/JSON errors propagate to detect_and_configure_hardware().
+    """
+    # Skip the fork+exec entirely when tt-smi isn't installed
+    if shutil.which('tt-smi') is None:
+        msgs.append("⚠️  Warning: tt-smi not found in PATH")
+        msgs.append("⚠️  Please install tt-smi or set MESH_DEVICE manually: export MESH_DEVICE=N150")
+        return None
+
+    # Run tt-smi -s to get hardware info in JSON format (kept as bytes)
+    result = subprocess.run(
+        ['tt-smi', '-s'],
+        capture_output=True,
+        timeout=10
+    )
+
+    if result.returncode != 0:
+        msgs.append(f"⚠️  Warning: tt-smi failed (exit code {result.returncode})")
+        msgs.append("⚠️  Please set MESH_DEVICE manually: export MESH_DEVICE=N150")
+        return None
+
+    output = result.stdout
+    match = _BOARD_TYPE_RE.search(output)
+    if match:
+        return match.group(1).decode('utf-8', 'replace').upper()
+
+    # Fallback: parse JSON output
+    import json
+    data = json.loads(output)
+
+    # Extract board type from device_info
+    if 'device_info' not in data or not data['device_info']:
+        msgs.append("⚠️  Warning: No device_info in tt-smi output")
+        msgs.append("⚠️  Please set MESH_DEVICE manually: export MESH_DEVICE=N150")
+        return None
+
+    device = data['device_info'][0]
+    if 'board_info' not in device or 'board_type' not in device['board_info']:
+        msgs.append("⚠️  Warning: No board_type in tt-smi output")
+        msgs.append("⚠️  Please set MESH_DEVICE manually: export MESH_DEVICE=N150")
+        return None
+
+    return device['board_info']['board_type'].upper()
+
+
+def detect_and_configure_hardware(msgs, refresh_hw=False):
     """
     Auto-detect Tenstorrent hardware and set required environment variables.
 
@@ -78,6 +206,10 @@ def detect_and_configure_hardware():
     - TT_METAL_ARCH_NAME: Architecture name (blackhole for P100/P150, auto-detected for others)
     - TT_METAL_HOME: Path to tt-metal installation (defaults to ~/tt-metal)
 
+    The board type is read from HW_CACHE_FILE when fresh, skipping the tt-smi
+    subprocess entirely; refresh_hw=True (--refresh-hw) forces re-detection.
+    Status lines are appended to msgs so __main__ can emit them in one write.
+
     Why this is needed:
     - vLLM requires MESH_DEVICE to target the correct hardware
     - Blackhole chips (P100/P150) need explicit TT_METAL_ARCH_NAME=blackhole
@@ -91,42 +223,25 @@ def detect_and_configure_hardware():
     - P150: Dual Blackhole chips
     - GALAXY: Multi-chip configurations
     """
+    import json
+
+    env = os.environ
+
     # Only auto-detect if not already set
-    if 'MESH_DEVICE' in os.environ:
-        print(f"✓ Using existing MESH_DEVICE={os.environ['MESH_DEVICE']}")
+    mesh_device = env.get('MESH_DEVICE')
+    if mesh_device:
+        msgs.append(f"✓ Using existing MESH_DEVICE={mesh_device}")
         return
 
     try:
-        # Run tt-smi -s to get hardware info in JSON format
-        result = subprocess.run(
-            ['tt-smi', '-s'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-
-        if result.returncode != 0:
-            print(f"⚠️  Warning: tt-smi failed (exit code {result.returncode})")
-            print("⚠️  Please set MESH_DEVICE manually: export MESH_DEVICE=N150")
-            return
-
-        # Parse JSON output
-        output = result.stdout
-        data = json.loads(output)
-
-        # Extract board type from device_info
-        if 'device_info' not in data or not data['device_info']:
-            print("⚠️  Warning: No device_info in tt-smi output")
-            print("⚠️  Please set MESH_DEVICE manually: export MESH_DEVICE=N150")
-            return
-
-        device = data['device_info'][0]
-        if 'board_info' not in device or 'board_type' not in device['board_info']:
-            print("⚠️  Warning: No board_type in tt-smi output")
-            print("⚠️  Please set MESH_DEVICE manually: export MESH_DEVICE=N150")
-            return
-
-        board_type = device['board_info']['board_type'].upper()
+        cached = None if refresh_hw else load_hw_cache()
+        if cached:
+            board_type = cached['board_type']
+            msgs.append(f"✓ Using cached hardware detection ({HW_CACHE_FILE})")
+        else:
+            board_type = query_board_type(msgs)
+            if board_type is None:
+                return
 
         # Map board_type to MESH_DEVICE
         # Examples: "N150 L" -> N150, "n300" -> N300, "P100" -> P100
@@ -149,88 +264,70 @@ def detect_and_configure_hardware():
             mesh_device = 'GALAXY'
             arch_name = None  # Auto-detect
         else:
-            print(f"⚠️  Warning: Unknown board type '{board_type}'")
-            print("⚠️  Please set MESH_DEVICE manually: export MESH_DEVICE=N150")
+            msgs.append(f"⚠️  Warning: Unknown board type '{board_type}'")
+            msgs.append("⚠️  Please set MESH_DEVICE manually: export MESH_DEVICE=N150")
             return
 
         # Set MESH_DEVICE
-        os.environ['MESH_DEVICE'] = mesh_device
-        print(f"✓ Auto-detected hardware: {mesh_device}")
+        env['MESH_DEVICE'] = mesh_device
+        msgs.append(f"✓ Auto-detected hardware: {mesh_device}")
 
         # Set TT_METAL_ARCH_NAME for Blackhole chips
-        if arch_name and 'TT_METAL_ARCH_NAME' not in os.environ:
-            os.environ['TT_METAL_ARCH_NAME'] = arch_name
-            print(f"✓ Auto-set TT_METAL_ARCH_NAME={arch_name}")
-
-        # Set TT_METAL_HOME if not already set (required for imports)
-        if 'TT_METAL_HOME' not in os.environ:
-            tt_metal_home = os.path.expanduser('~/tt-metal')
-            if os.path.exists(tt_metal_home):
-                os.environ['TT_METAL_HOME'] = tt_metal_home
-                print(f"✓ Auto-set TT_METAL_HOME={tt_metal_home}")
+        if arch_name and not env.get('TT_METAL_ARCH_NAME'):
+            env['TT_METAL_ARCH_NAME'] = arch_name
+            msgs.append(f"✓ Auto-set TT_METAL_ARCH_NAME={arch_name}")
+
+        # Set TT_METAL_HOME if not already set (required for imports).
+        # A path validated within the cache TTL is trusted without a stat.
+        tt_metal_home = cached.get('tt_metal_home') if cached else None
+        if not env.get('TT_METAL_HOME'):
+            if not tt_metal_home:
+                candidate = os.path.join(os.path.expanduser('~'), 'tt-metal')
+                if os.path.isdir(candidate):
+                    tt_metal_home = candidate
+            if tt_metal_home:
+                env['TT_METAL_HOME'] = tt_metal_home
+                msgs.append(f"✓ Auto-set TT_METAL_HOME={tt_metal_home}")
             else:
-                print(f"⚠️  Warning: ~/tt-metal not found")
-                print("⚠️  Please set TT_METAL_HOME: export TT_METAL_HOME=/path/to/tt-metal")
+                msgs.append(f"⚠️  Warning: ~/tt-metal not found")
+                msgs.append("⚠️  Please set TT_METAL_HOME: export TT_METAL_HOME=/path/to/tt-metal")
+
+        if not cached or (tt_metal_home and not cached.get('tt_metal_home')):
+            save_hw_cache(board_type, tt_metal_home)
 
     except subprocess.TimeoutExpired:
-        print("⚠️  Warning: tt-smi timed out")
-        print("⚠️  Please set MESH_DEVICE manually: export MESH_DEVICE=N150")
+        msgs.append("⚠️  Warning: tt-smi timed out")
+        msgs.append("⚠️  Please set MESH_DEVICE manually: export MESH_DEVICE=N150")
     except json.JSONDecodeError as e:
-        print(f"⚠️  Warning: Failed to parse tt-smi output: {e}")
-        print("⚠️  Please set MESH_DEVICE manually: export MESH_DEVICE=N150")
-    except FileNotFoundError:
-        print("⚠️  Warning: tt-smi not found in PATH")
-        print("⚠️  Please install tt-smi or set MESH_DEVICE manually: export MESH_DEVICE=N150")
+        msgs.append(f"⚠️  Warning: Failed to parse tt-smi output: {e}")
+        msgs.append("⚠️  Please set MESH_DEVICE manually: export MESH_DEVICE=N150")
     except Exception as e:
-        print(f"⚠️  Warning: Hardware detection failed: {e}")
-        print("⚠️  Please set MESH_DEVICE manually: export MESH_DEVICE=N150")
+        msgs.append(f"⚠️  Warning: Hardware detection failed: {e}")
+        msgs.append("⚠️  Please set MESH_DEVICE manually: export MESH_DEVICE=N150")
 
 
-def auto_detect_hf_model():
+def detect_model_family(model_name):
+    """Return the lowercase family keyword in model_name (e.g. 'qwen'), or None."""
+    match = _ORG_RE.search(model_name)
+    return match.group(1).lower() if match else None
+
+
+def configure_from_argv(msgs):
     """
-    Auto-detect and set HF_MODEL environment variable from --model path.
+    Configure HF_MODEL and inject sensible vLLM defaults from the --model argument.
 
-    This is REQUIRED for non-Llama models to work correctly with vLLM on TT hardware.
-    The HF_MODEL tells vLLM the HuggingFace model identifier, separate from the local path.
+    Walks sys.argv once: finds --model, derives the model name and family, then
+    (1) sets HF_MODEL if not already set and (2) appends any default flags the
+    user didn't pass. Status lines are appended to msgs.
 
-    Examples:
+    HF_MODEL is REQUIRED for non-Llama models to work correctly with vLLM on TT hardware.
+    It tells vLLM the HuggingFace model identifier, separate from the local path:
         --model ~/models/Qwen3-0.6B  →  HF_MODEL=Qwen/Qwen3-0.6B
         --model ~/models/gemma-3-1b-it  →  HF_MODEL=google/gemma-3-1b-it
         --model ~/models/Llama-3.1-8B-Instruct  →  No HF_MODEL needed (Llama auto-detects)
-    """
-    # Only auto-set if HF_MODEL is not already set
-    if 'HF_MODEL' in os.environ:
-        print(f"✓ Using existing HF_MODEL={os.environ['HF_MODEL']}")
-        return
-
-    # Find --model argument
-    if '--model' not in sys.argv:
-        return
-
-    try:
-        model_path = sys.argv[sys.argv.index('--model') + 1]
-        model_name = os.path.basename(model_path.rstrip('/'))
-
-        # Detect model type and set HF_MODEL accordingly
-        if 'Qwen' in model_name or 'qwen' in model_name.lower():
-            # Qwen models: Qwen/Qwen3-0.6B, Qwen/Qwen3-8B, etc.
-            os.environ['HF_MODEL'] = f'Qwen/{model_name}'
-            print(f"✓ Auto-detected HF_MODEL=Qwen/{model_name}")
-        elif 'gemma' in model_name.lower():
-            # Gemma models: google/gemma-3-1b-it, google/gemma-3-4b-it, etc.
-            os.environ['HF_MODEL'] = f'google/{model_name}'
-            print(f"✓ Auto-detected HF_MODEL=google/{model_name}")
-        # Note: Llama models don't need HF_MODEL set - they auto-detect correctly
-    except (ValueError, IndexError):
-        pass  # No --model argument or invalid format
 
-
-def inject_defaults():
-    """
-    Inject sensible default parameters if not already provided.
-
-    This makes the script much easier to use - just specify --model and you're good to go!
-    All defaults can be overridden by passing the argument explicitly.
+    The defaults make the script much easier to use - just specify --model and you're
+    good to go! All defaults can be overridden by passing the argument explicitly.
 
     Auto-injected parameters:
     - --served-model-name: Clean model name (e.g., Qwen/Qwen3-0.6B instead of path)
@@ -245,47 +342,47 @@ def inject_defaults():
         # Override defaults as needed:
         python start-vllm-server.py --model ~/models/Qwen3-0.6B --max-model-len 8192
     """
+    # Only auto-set HF_MODEL if it is not already set
+    existing_hf_model = os.environ.get('HF_MODEL')
+    if existing_hf_model:
+        msgs.append(f"✓ Using existing HF_MODEL={existing_hf_model}")
+
     # Find --model argument to extract model name
-    if '--model' not in sys.argv:
+    argv_set = set(sys.argv)
+    if '--model' not in argv_set:
         return
 
     try:
         model_idx = sys.argv.index('--model')
         model_path = sys.argv[model_idx + 1]
         model_name = os.path.basename(model_path.rstrip('/'))
+        family = detect_model_family(model_name)
+
+        # Qwen models: Qwen/Qwen3-0.6B, Qwen/Qwen3-8B, etc.
+        # Gemma models: google/gemma-3-1b-it, google/gemma-3-4b-it, etc.
+        # Note: Llama models don't need HF_MODEL set - they auto-detect correctly
+        if not existing_hf_model and family in ('qwen', 'gemma'):
+            hf_model = f'{_ORG_MAP[family]}/{model_name}'
+            os.environ['HF_MODEL'] = hf_model
+            msgs.append(f"✓ Auto-detected HF_MODEL={hf_model}")
 
         # Auto-set --served-model-name if not provided
-        if '--served-model-name' not in sys.argv:
+        if '--served-model-name' not in argv_set:
             # Detect model org and set clean served name
-            if 'Qwen' in model_name or 'qwen' in model_name.lower():
-                served_name = f'Qwen/{model_name}'
-            elif 'gemma' in model_name.lower():
-                served_name = f'google/{model_name}'
-            elif 'Llama' in model_name or 'llama' in model_name.lower():
-                served_name = f'meta-llama/{model_name}'
-            elif 'Mistral' in model_name or 'mistral' in model_name.lower():
-                served_name = f'mistralai/{model_name}'
-            else:
-                # Fallback: use model name as-is
-                served_name = model_name
+            org = _ORG_MAP.get(family)
+            # Fallback: use model name as-is
+            served_name = f'{org}/{model_name}' if org else model_name
 
             sys.argv.extend(['--served-model-name', served_name])
-            print(f"✓ Auto-set --served-model-name={served_name}")
+            msgs.append(f"✓ Auto-set --served-model-name={served_name}")
 
         # Set sensible defaults for vLLM parameters
-        defaults = {
-            '--max-model-len': '2048',    # Good for development, prevents OOM
-            '--max-num-seqs': '16',       # Balanced for small models
-            '--block-size': '64',         # Standard KV cache block size
-        }
-
-        for param, value in defaults.items():
-            if param not in sys.argv:
-                sys.argv.extend([param, value])
-                print(f"✓ Auto-set {param}={value}")
+        missing = [(param, value) for param, value in DEFAULTS if param not in argv_set]
+        sys.argv.extend([arg for pair in missing for arg in pair])
+        msgs.extend(f"✓ Auto-set {param}={value}" for param, value in missing)
 
-    except (ValueError, IndexError):
-        pass  # No --model argument or invalid format
+    except IndexError:
+        pass  # --model without a value
 
 
 def verify_dependencies():
@@ -342,33 +439,49 @@ def verify_dependencies():
 
 
 if __name__ == '__main__':
-    print("=" * 60)
-    print("🚀 Starting vLLM Server with Auto-Configuration")
-    print("=" * 60)
+    # Use spawn for vLLM workers up front: fork-based workers can fail to
+    # re-initialize and fall back through a slow retry path. Also silence the
+    # tokenizers fork-safety check. Both can still be overridden by the user.
+    os.environ.setdefault('VLLM_WORKER_MULTIPROC_METHOD', 'spawn')
+    os.environ.setdefault('TOKENIZERS_PARALLELISM', 'false')
+
+    banner = "=" * 60
+    sys.stdout.write(f"{banner}\n🚀 Starting vLLM Server with Auto-Configuration\n{banner}\n")
+
+    # --refresh-hw is ours, not vLLM's - strip it before argv is passed through
+    refresh_hw = '--refresh-hw' in sys.argv
+    if refresh_hw:
+        sys.argv.remove('--refresh-hw')
+
+    # Status lines from steps 1-2, written out in one go after step 2
+    msgs = []
 
     # Step 1: Detect hardware and configure environment variables
     # This must happen FIRST so environment is ready for everything else
-    detect_and_configure_hardware()
+    detect_and_configure_hardware(msgs, refresh_hw)
 
-    # Step 2: Inject sensible defaults for easy usage
+    # Step 2: Auto-detect HF_MODEL and inject sensible defaults from --model
     # Makes minimal command work: python start-vllm-server.py --model ~/models/Qwen3-0.6B
-    inject_defaults()
-
-    # Step 3: Auto-detect HF_MODEL from --model path
     # This must happen before registering TT models
-    auto_detect_hf_model()
+    configure_from_argv(msgs)
 
-    # Step 4: Verify and install required dependencies
+    if msgs:
+        sys.stdout.write("\n".join(msgs) + "\n")
+        sys.stdout.flush()
+
+    # Step 3: Verify and install required dependencies
     # Ensures llama-models, loguru, pytest, and other deps are installed
     verify_dependencies()
 
-    # Step 5: Register TT models with vLLM
+    # Step 4: Register TT models with vLLM
     # This must happen before vLLM loads any models
     register_tt_models()
 
-    print("=" * 60)
-    print("✓ All checks complete - Starting vLLM API server...")
-    print("=" * 60)
+    sys.stdout.write(f"{banner}\n✓ All checks complete - Starting vLLM API server...\n{banner}\n")
+    sys.stdout.flush()
+
+    # vLLM's spawned workers inherit this and register TT models via sitecustomize.py
+    os.environ['TT_JUKEBOX_REGISTER_MODELS'] = '1'
 
     # Start the vLLM API server
     # Command-line arguments are passed through with auto-injected defaults
@@ -398,4 +511,5 @@ if __name__ == '__main__':
     # The model architecture is auto-detected from config.json
     # HF_MODEL is auto-detected from your --model path (or manually set via export HF_MODEL=...)
     # If it's Llama-compatible, it uses the TT-optimized implementation!
+    import runpy
     runpy.run_module("vllm.entrypoints.openai.api_server", run_name="__main__")
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Check that the fused search_specs() agrees with filter-then-match.
+
+Run with: python -m unittest discover tests
+"""
+
+import contextlib
+import copy
+import importlib.util
+import io
+import unittest
+from pathlib import Path
+
+_SCRIPT = Path(__file__).resolve().parent.parent / 'tt-jukebox.py'
+
+
+def _load_jukebox():
+    """Import tt-jukebox.py (hyphenated, so not importable by name)."""
+    spec = importlib.util.spec_from_file_location('tt_jukebox', _SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+jukebox = _load_jukebox()
+
+
+def _spec(name, device, status='COMPLETE', arch='wormhole_b0', params=8):
+    return {
+        'model_name': name,
+        'model_id': f'id_{name}_{device}',
+        'hf_model_repo': f'org/{name}',
+        'device_type': device,
+        'status': status,
+        'param_count': params,
+        'env_vars': {'ARCH_NAME': arch},
+    }
+
+
+SPECS = [
+    _spec('Llama-3.1-8B-Instruct', 'N150'),
+    _spec('Llama-3.1-8B-Instruct', 'N300'),
+    _spec('Llama-3.2-1B', 'N150', status='EXPERIMENTAL', params=1),
+    _spec('Llama-3.1-70B', 'T3K', params=70),
+    _spec('Qwen2.5-7B', 'N150', params=7),
+    _spec('Qwen2.5-7B', 'N300', params=7),
+    _spec('CodeLlama-7B', 'N150', params=7),
+    _spec('Mistral-7B', 'P150', arch='blackhole', params=7),
+    _spec('Qwen3-32B', 'P150X4', arch='blackhole', params=32),
+]
+
+
+def _names(specs):
+    return [(s['model_name'], s['device_type'], s.get('match_score')) for s in specs]
+
+
+class SearchSpecsTest(unittest.TestCase):
+
+    def test_hardware_and_name_match_filter_then_match(self):
+        for hardware in ('N150', 'N300', 'T3K', 'P150', 'XYZ'):
+            for query in ('llama', 'qwen', 'llama-3.1', 'instruct', '7b', 'mistral', 'nope'):
+                with self.subTest(hardware=hardware, query=query):
+                    specs = jukebox._prepare_specs(copy.deepcopy(SPECS))
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        validated, _ = jukebox.filter_by_hardware(specs, hardware)
+                        expected = _names(jukebox.match_model_name(validated, query))
+
+                    specs = jukebox._prepare_specs(copy.deepcopy(SPECS))
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        combined, _ = jukebox.search_specs(specs, hardware, model_query=query)
+                    self.assertEqual(_names(combined), expected)
+
+    # Fixed expectations, matching the original per-spec matchers
+
+    def test_substring_that_is_not_a_prefix_matches(self):
+        specs = copy.deepcopy(SPECS)
+        self.assertEqual(_names(jukebox.match_model_name(specs, 'llama')), [
+            ('Llama-3.1-8B-Instruct', 'N150', 80),
+            ('Llama-3.1-8B-Instruct', 'N300', 80),
+            ('Llama-3.2-1B', 'N150', 80),
+            ('Llama-3.1-70B', 'T3K', 80),
+            ('CodeLlama-7B', 'N150', 80),
+        ])
+
+    def test_name_word_in_the_middle_matches(self):
+        specs = copy.deepcopy(SPECS)
+        self.assertEqual(_names(jukebox.match_model_name(specs, '7b')), [
+            ('Qwen2.5-7B', 'N150', 80),
+            ('Qwen2.5-7B', 'N300', 80),
+            ('CodeLlama-7B', 'N150', 80),
+            ('Mistral-7B', 'P150', 80),
+        ])
+
+    def test_task_only(self):
+        specs = copy.deepcopy(SPECS)
+        self.assertEqual(_names(jukebox.match_task(specs, 'code')), [
+            ('Llama-3.1-8B-Instruct', 'N150', 70),
+            ('Llama-3.1-8B-Instruct', 'N300', 70),
+            ('Llama-3.2-1B', 'N150', 70),
+            ('Llama-3.1-70B', 'T3K', 70),
+            ('Qwen2.5-7B', 'N150', 70),
+            ('Qwen2.5-7B', 'N300', 70),
+            ('CodeLlama-7B', 'N150', 70),
+            ('Qwen3-32B', 'P150X4', 70),
+        ])
+
+        # Unknown tasks are used as the keyword
+        specs = copy.deepcopy(SPECS)
+        self.assertEqual(_names(jukebox.match_task(specs, 'instruct')), [
+            ('Llama-3.1-8B-Instruct', 'N150', 70),
+            ('Llama-3.1-8B-Instruct', 'N300', 70),
+        ])
+
+    def test_no_hardware_keeps_every_spec_validated(self):
+        specs = copy.deepcopy(SPECS)
+        validated, experimental = jukebox.search_specs(specs)
+        self.assertEqual(validated, specs)
+        self.assertEqual(experimental, [])
+
+        specs = copy.deepcopy(SPECS)
+        validated, experimental = jukebox.search_specs(specs, model_query='qwen')
+        self.assertEqual(_names(validated), [
+            ('Qwen2.5-7B', 'N150', 80),
+            ('Qwen2.5-7B', 'N300', 80),
+            ('Qwen3-32B', 'P150X4', 80),
+        ])
+        self.assertEqual(experimental, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,53 +14,64 @@ Author: Tenstorrent Developer Extension
 Version: 1.0.0
 """
 
+import importlib.util
+import os
+import shutil
+import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict, Any
-from datetime import datetime
+from typing import TYPE_CHECKING, Optional, List, Dict, Any
 
-try:
+# textual/rich are imported lazily by _load_tui_deps() so that short-lived
+# invocations (missing deps, importing this module for TT_COLORS) don't pay
+# for their import chains. These imports are for type checkers only.
+if TYPE_CHECKING:
     from textual.app import App, ComposeResult
-    from textual.containers import Container, Horizontal, Vertical, VerticalScroll
-    from textual.widgets import (
-        Header, Footer, Button, Static, DataTable, Input,
-        Label, TabbedContent, TabPane, Log, Tree, RichLog
-    )
-    from textual.binding import Binding
-    from textual.reactive import reactive
-    from textual import on
+    from textual.widgets import Static, DataTable, Input
     from rich.text import Text
-    from rich.table import Table as RichTable
-    from rich.panel import Panel
-    from rich.syntax import Syntax
-    from rich.console import Console
-except ImportError:
-    print("Error: TUI dependencies not installed.")
-    print("Please install with: pip install -r requirements-tui.txt")
-    print("Or: pip install 'textual>=0.47.0' 'rich>=13.7.0'")
-    sys.exit(1)
+
+TUI_DEPENDENCIES = ("textual", "rich")
+
 
 # Import core functions from main CLI
-try:
-    import importlib.util
+class _LazyJukebox:
+    """
+    Proxy for tt-jukebox.py that executes the module on first attribute access.
+
+    The spec is resolved up front (cheap) but exec_module() is deferred until a
+    panel actually calls into the CLI, e.g. tt_jukebox.detect_hardware().
+    """
+
+    def __init__(self, path: Path):
+        self._path = path
+        self._mod = None
+
+    def _load(self):
+        try:
+            if not self._path.exists():
+                raise FileNotFoundError(f"Could not find tt-jukebox.py at {self._path}")
 
-    # Find tt-jukebox.py in the same directory as this script
-    tui_path = Path(__file__).resolve()
-    jukebox_path = tui_path.parent / "tt-jukebox.py"
+            spec = importlib.util.spec_from_file_location("tt_jukebox", str(self._path))
+            if not (spec and spec.loader):
+                raise ImportError("Could not load tt-jukebox.py")
 
-    if not jukebox_path.exists():
-        raise FileNotFoundError(f"Could not find tt-jukebox.py at {jukebox_path}")
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            self._mod = module
+        except Exception as e:
+            print(f"Error: Could not import tt-jukebox.py: {e}")
+            print("Please ensure tt-jukebox.py is in the same directory as tt-jukebox-tui.py")
+            sys.exit(1)
 
-    spec = importlib.util.spec_from_file_location("tt_jukebox", str(jukebox_path))
-    if spec and spec.loader:
-        tt_jukebox = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(tt_jukebox)
-    else:
-        raise ImportError("Could not load tt-jukebox.py")
-except Exception as e:
-    print(f"Error: Could not import tt-jukebox.py: {e}")
-    print("Please ensure tt-jukebox.py is in the same directory as tt-jukebox-tui.py")
-    sys.exit(1)
+    def __getattr__(self, name: str):
+        if self._mod is None:
+            self._load()
+        return getattr(self._mod, name)
+
+
+# Find tt-jukebox.py in the same directory as this script
+tt_jukebox = _LazyJukebox(Path(__file__).resolve().parent / "tt-jukebox.py")
 
 
 # ============================================================================
@@ -80,546 +91,805 @@ TT_COLORS = {
     "pink": "#EC96B8",             # Accent color
 }
 
+# Style strings and markup literals, formatted once at import instead of on
+# every panel refresh
+_STYLES = {
+    "title_cyan": f"bold {TT_COLORS['primary_cyan']}",
+    "title_lcyan": f"bold {TT_COLORS['light_cyan']}",
+    "hw_not_detected": f"[{TT_COLORS['warning']}]Not detected[/]",
+    "fw_unknown": f"[{TT_COLORS['muted']}]Unknown[/]",
+    "not_installed": f"[{TT_COLORS['muted']}]Not installed[/]",
+    "detecting": f"[{TT_COLORS['muted']}]Detecting...[/]",
+    "status_ready": f"[{TT_COLORS['success']}]✓ Ready[/]",
+    "status_no_hw": f"[{TT_COLORS['warning']}]⚠ No hardware[/]",
+    "env_matches": f"  [{TT_COLORS['success']}]✓ Current environment matches[/]",
+    "setup_required": f"  [{TT_COLORS['warning']}]⚠ Setup required[/]",
+}
 
-# ============================================================================
-# Custom Widgets
-# ============================================================================
+# App stylesheet; {color} placeholders are filled from TT_COLORS via format_map
+_CSS_TEMPLATE = """
+Screen {{
+    background: {darker_bg};
+}}
+
+Header {{
+    background: {dark_bg};
+    color: {primary_cyan};
+}}
+
+Footer {{
+    background: {dark_bg};
+    color: {text};
+}}
+
+Input {{
+    border: tall {primary_cyan};
+    background: {darker_bg};
+    color: {text};
+}}
+
+Input:focus {{
+    border: tall {light_cyan};
+}}
+
+Button {{
+    background: {primary_cyan};
+    color: {darker_bg};
+    border: none;
+}}
+
+Button:hover {{
+    background: {light_cyan};
+}}
+
+DataTable {{
+    background: {darker_bg};
+    color: {text};
+}}
+
+DataTable > .datatable--cursor {{
+    background: {dark_bg};
+    color: {primary_cyan};
+}}
+
+DataTable > .datatable--header {{
+    background: {dark_bg};
+    color: {light_cyan};
+    text-style: bold;
+}}
+
+Static {{
+    background: {darker_bg};
+    color: {text};
+}}
+
+#status-panel {{
+    height: auto;
+    padding: 1;
+}}
+
+#search-container {{
+    height: auto;
+    padding: 1;
+}}
+
+#model-table {{
+    height: 1fr;
+}}
+
+#detail-column {{
+    width: 45;
+}}
+
+#command-panel {{
+    height: 12;
+    padding: 1;
+}}
+"""
 
-class HardwareStatusPanel(Static):
-    """Display current hardware and firmware information."""
-
-    def __init__(self):
-        super().__init__()
-        self.hardware = None
-        self.firmware = None
-        self.update_hardware_info()
-
-    def update_hardware_info(self):
-        """Fetch hardware and firmware information."""
-        self.hardware = tt_jukebox.detect_hardware()
-        self.firmware = tt_jukebox.get_firmware_version()
-        self.refresh_display()
-
-    def refresh_display(self):
-        """Update the display with current hardware info."""
-        table = RichTable.grid(padding=(0, 2))
-        table.add_column(style=f"bold {TT_COLORS['primary_cyan']}")
-        table.add_column(style=TT_COLORS['text'])
-
-        # Hardware
-        if self.hardware:
-            table.add_row("Hardware:", f"[bold]{self.hardware}[/bold]")
-        else:
-            table.add_row("Hardware:", f"[{TT_COLORS['warning']}]Not detected[/]")
-
-        # Firmware
-        if self.firmware:
-            table.add_row("Firmware:", self.firmware)
-        else:
-            table.add_row("Firmware:", f"[{TT_COLORS['muted']}]Unknown[/]")
-
-        # Status
-        status = "✓ Ready" if self.hardware else "⚠ No hardware"
-        status_color = TT_COLORS['success'] if self.hardware else TT_COLORS['warning']
-        table.add_row("Status:", f"[{status_color}]{status}[/]")
-
-        panel = Panel(
-            table,
-            title="[bold]Hardware Status[/bold]",
-            border_style=TT_COLORS['primary_cyan'],
-            padding=(1, 2)
-        )
-        self.update(panel)
-
-
-class EnvironmentPanel(Static):
-    """Display current tt-metal and vLLM installation information."""
-
-    def __init__(self):
-        super().__init__()
-        self.metal_info = None
-        self.vllm_info = None
-        self.update_environment_info()
-
-    def update_environment_info(self):
-        """Fetch environment information."""
-        self.metal_info = tt_jukebox.detect_tt_metal()
-        self.vllm_info = tt_jukebox.detect_tt_vllm()
-        self.refresh_display()
-
-    def refresh_display(self):
-        """Update the display with current environment info."""
-        table = RichTable.grid(padding=(0, 2))
-        table.add_column(style=f"bold {TT_COLORS['light_cyan']}")
-        table.add_column(style=TT_COLORS['text'])
-
-        # tt-metal
-        if self.metal_info:
-            commit = self.metal_info.get('commit', 'unknown')[:7]
-            path = self.metal_info.get('path', 'unknown')
-            table.add_row("tt-metal:", f"{commit} at {path}")
-        else:
-            table.add_row("tt-metal:", f"[{TT_COLORS['muted']}]Not installed[/]")
-
-        # vLLM
-        if self.vllm_info:
-            commit = self.vllm_info.get('commit', 'unknown')[:7]
-            path = self.vllm_info.get('path', 'unknown')
-            table.add_row("vLLM:", f"{commit} at {path}")
-        else:
-            table.add_row("vLLM:", f"[{TT_COLORS['muted']}]Not installed[/]")
-
-        # Python
-        python_version, _ = tt_jukebox.check_python_version()
-        table.add_row("Python:", python_version)
-
-        panel = Panel(
-            table,
-            title="[bold]Environment[/bold]",
-            border_style=TT_COLORS['light_cyan'],
-            padding=(1, 2)
-        )
-        self.update(panel)
-
-
-class ModelDetailPanel(Static):
-    """Display detailed information about a selected model."""
-
-    def __init__(self):
-        super().__init__()
-        self.current_spec = None
-        self.update("")
-
-    def show_model(self, spec: Dict[str, Any], env_match: Optional[Dict] = None):
-        """Display model specification details."""
-        self.current_spec = spec
-
-        # Create detail view
-        lines = []
-        lines.append(f"[bold {TT_COLORS['primary_cyan']}]{spec.get('model_name', 'Unknown')}[/]")
-        lines.append("")
-
-        # Basic Info
-        lines.append(f"[bold]Device:[/] {spec.get('device_type', 'Unknown')}")
-        lines.append(f"[bold]Version:[/] {spec.get('version', 'Unknown')}")
-
-        # Commits
-        metal_commit = spec.get('tt_metal_commit', 'Unknown')
-        vllm_commit = spec.get('vllm_commit', 'Unknown')
-        lines.append(f"[bold]tt-metal:[/] {metal_commit}")
-        lines.append(f"[bold]vLLM:[/] {vllm_commit}")
-        lines.append("")
-
-        # Device Specs
-        if 'device_model_spec' in spec:
-            dms = spec['device_model_spec']
-            lines.append("[bold]Device Configuration:[/]")
-            lines.append(f"  Max Context: {dms.get('max_context', 'N/A')}")
-            lines.append(f"  Max Seqs: {dms.get('max_num_seqs', 'N/A')}")
-            lines.append(f"  Block Size: {dms.get('block_size', 'N/A')}")
-            lines.append("")
-
-        # Resource Requirements
-        lines.append("[bold]Requirements:[/]")
-        lines.append(f"  Disk: {spec.get('min_disk_gb', 'N/A')} GB")
-        lines.append(f"  RAM: {spec.get('min_ram_gb', 'N/A')} GB")
-        lines.append("")
-
-        # Model Info
-        if 'hf_model_repo' in spec:
-            lines.append(f"[bold]HuggingFace:[/] {spec['hf_model_repo']}")
-
-        # Environment Match Status
-        if env_match:
-            lines.append("")
-            lines.append("[bold]Environment Match:[/]")
-            match_status = env_match.get('overall_match', False)
-            if match_status:
-                lines.append(f"  [{TT_COLORS['success']}]✓ Current environment matches[/]")
-            else:
-                lines.append(f"  [{TT_COLORS['warning']}]⚠ Setup required[/]")
-
-                if not env_match.get('metal_match'):
-                    req = env_match.get('metal_required', 'Unknown')
-                    lines.append(f"  tt-metal: {req}")
-
-                if not env_match.get('vllm_match'):
-                    req = env_match.get('vllm_required', 'Unknown')
-                    lines.append(f"  vLLM: {req}")
-
-        content = "\n".join(lines)
-        panel = Panel(
-            content,
-            title="[bold]Model Details[/bold]",
-            border_style=TT_COLORS['primary_cyan'],
-            padding=(1, 2)
-        )
-        self.update(panel)
-
-    def clear(self):
-        """Clear the detail panel."""
-        self.current_spec = None
-        panel = Panel(
-            "[dim]Select a model to view details[/dim]",
-            title="[bold]Model Details[/bold]",
-            border_style=TT_COLORS['muted'],
-            padding=(1, 2)
-        )
-        self.update(panel)
-
-
-class CommandPreviewPanel(Static):
-    """Display the vLLM command for the selected model."""
-
-    def __init__(self):
-        super().__init__()
-        self.current_command = None
-        self.clear()
-
-    def show_command(self, spec: Dict[str, Any], model_info: Dict[str, str]):
-        """Display formatted vLLM command."""
-        commands = tt_jukebox.format_cli_command(spec, model_info)
-        self.current_command = commands.get('server', '')
-
-        # Format the command nicely
-        syntax = Syntax(
-            self.current_command,
-            "bash",
-            theme="monokai",
-            line_numbers=False,
-            word_wrap=True
-        )
-
-        panel = Panel(
-            syntax,
-            title="[bold]vLLM Server Command[/bold]",
-            subtitle="[dim]Press Ctrl+C to copy[/dim]",
-            border_style=TT_COLORS['success'],
-            padding=(1, 2)
-        )
-        self.update(panel)
-
-    def clear(self):
-        """Clear the command panel."""
-        self.current_command = None
-        panel = Panel(
-            "[dim]Select a model to see the command[/dim]",
-            title="[bold]vLLM Server Command[/bold]",
-            border_style=TT_COLORS['muted'],
-            padding=(1, 2)
-        )
-        self.update(panel)
+# ModelDetailPanel section templates, filled with str.format_map(_SafeDict(...))
+_DETAIL_SUMMARY_TMPL = (
+    f"[{_STYLES['title_cyan']}]{{model_name}}[/]\n"
+    "\n"
+    "[bold]Device:[/] {device_type}\n"
+    "[bold]Version:[/] {version}\n"
+    "[bold]tt-metal:[/] {tt_metal_commit}\n"
+    "[bold]vLLM:[/] {vllm_commit}\n"
+)
+_DETAIL_DEVICE_CONFIG_TMPL = (
+    "[bold]Device Configuration:[/]\n"
+    "  Max Context: {max_context}\n"
+    "  Max Seqs: {max_num_seqs}\n"
+    "  Block Size: {block_size}\n"
+)
+_DETAIL_REQUIREMENTS_TMPL = (
+    "[bold]Requirements:[/]\n"
+    "  Disk: {min_disk_gb} GB\n"
+    "  RAM: {min_ram_gb} GB\n"
+)
+_DETAIL_ENV_MATCH_HEADER = "[bold]Environment Match:[/]"
+
+# Seconds the search input must be idle before the model table is filtered
+_SEARCH_DEBOUNCE = 0.15
+
+# Max rendered commands kept by CommandPreviewPanel
+_SYNTAX_CACHE_SIZE = 16
+
+
+def _clipboard_command() -> Optional[List[str]]:
+    """Return the first clipboard tool installed here (pbcopy, wl-copy, xclip), or None."""
+    candidates = [['pbcopy']] if sys.platform == 'darwin' else []
+    if os.environ.get('WAYLAND_DISPLAY'):
+        candidates.append(['wl-copy'])
+    candidates.append(['xclip', '-selection', 'clipboard'])
+    for command in candidates:
+        if shutil.which(command[0]):
+            return command
+    return None
+
+
+class _SafeDict(dict):
+    """Mapping for str.format_map() that renders missing keys as a placeholder."""
+
+    def __init__(self, *args, missing: str = "N/A", **kwargs):
+        super().__init__(*args, **kwargs)
+        self._missing = missing
+
+    def __missing__(self, key: str) -> str:
+        return self._missing
 
 
 # ============================================================================
-# Main TUI Application
+# Lazy TUI Dependencies
 # ============================================================================
 
-class TTJukeboxTUI(App):
-    """Main TUI application for TT-Jukebox."""
-
-    CSS = f"""
-    Screen {{
-        background: {TT_COLORS['darker_bg']};
-    }}
-
-    Header {{
-        background: {TT_COLORS['dark_bg']};
-        color: {TT_COLORS['primary_cyan']};
-    }}
-
-    Footer {{
-        background: {TT_COLORS['dark_bg']};
-        color: {TT_COLORS['text']};
-    }}
-
-    Input {{
-        border: tall {TT_COLORS['primary_cyan']};
-        background: {TT_COLORS['darker_bg']};
-        color: {TT_COLORS['text']};
-    }}
-
-    Input:focus {{
-        border: tall {TT_COLORS['light_cyan']};
-    }}
-
-    Button {{
-        background: {TT_COLORS['primary_cyan']};
-        color: {TT_COLORS['darker_bg']};
-        border: none;
-    }}
-
-    Button:hover {{
-        background: {TT_COLORS['light_cyan']};
-    }}
-
-    DataTable {{
-        background: {TT_COLORS['darker_bg']};
-        color: {TT_COLORS['text']};
-    }}
-
-    DataTable > .datatable--cursor {{
-        background: {TT_COLORS['dark_bg']};
-        color: {TT_COLORS['primary_cyan']};
-    }}
-
-    DataTable > .datatable--header {{
-        background: {TT_COLORS['dark_bg']};
-        color: {TT_COLORS['light_cyan']};
-        text-style: bold;
-    }}
-
-    Static {{
-        background: {TT_COLORS['darker_bg']};
-        color: {TT_COLORS['text']};
-    }}
-
-    #status-panel {{
-        height: auto;
-        padding: 1;
-    }}
-
-    #search-container {{
-        height: auto;
-        padding: 1;
-    }}
-
-    #model-table {{
-        height: 1fr;
-    }}
-
-    #detail-column {{
-        width: 45;
-    }}
-
-    #command-panel {{
-        height: 12;
-        padding: 1;
-    }}
+# Names published into module globals by _load_tui_deps()
+_LAZY_NAMES = (
+    "HardwareStatusPanel",
+    "EnvironmentPanel",
+    "ModelDetailPanel",
+    "CommandPreviewPanel",
+    "TTJukeboxTUI",
+)
+
+
+def missing_tui_dependencies() -> List[str]:
+    """Return the TUI dependencies that aren't importable (without importing them)."""
+    return [name for name in TUI_DEPENDENCIES if importlib.util.find_spec(name) is None]
+
+
+def _load_tui_deps() -> None:
     """
+    Import textual/rich and define the TUI widgets and app.
 
-    BINDINGS = [
-        Binding("q", "quit", "Quit", priority=True),
-        Binding("r", "refresh", "Refresh", priority=True),
-        Binding("s", "setup", "Setup", priority=True),
-        Binding("c", "copy_command", "Copy Command", priority=True),
-        Binding("h", "help", "Help", priority=True),
-        Binding("/", "focus_search", "Search", priority=True),
-        Binding("escape", "clear_search", "Clear Search", priority=True),
-    ]
-
-    TITLE = "TT-Jukebox - Interactive Model Manager"
-
-    # Reactive properties
-    search_query: reactive[str] = reactive("")
-    selected_spec: reactive[Optional[Dict]] = reactive(None)
-
-    def __init__(self):
-        super().__init__()
-        self.hardware = None
-        self.firmware = None
-        self.metal_info = None
-        self.vllm_info = None
-        self.all_specs = []
-        self.filtered_specs = []
-        self.experimental_specs = []
-
-    def compose(self) -> ComposeResult:
-        """Create the UI layout."""
-        yield Header()
-
-        with Horizontal():
-            # Left column: Status and model browser
-            with Vertical():
-                with Container(id="status-panel"):
-                    yield HardwareStatusPanel()
-                    yield EnvironmentPanel()
-
-                with Container(id="search-container"):
-                    yield Label("Search models:")
-                    yield Input(placeholder="Type to filter models...", id="search-input")
-
-                yield DataTable(id="model-table")
-
-            # Right column: Details and command
-            with Vertical(id="detail-column"):
-                yield ModelDetailPanel()
-                with Container(id="command-panel"):
-                    yield CommandPreviewPanel()
-
-        yield Footer()
-
-    def on_mount(self) -> None:
-        """Initialize the application on mount."""
-        self.load_data()
-        self.setup_table()
-
-    def load_data(self):
-        """Load hardware info and model specs."""
-        # Detect hardware
-        self.hardware = tt_jukebox.detect_hardware()
-        self.firmware = tt_jukebox.get_firmware_version()
-
-        # Detect environment
-        self.metal_info = tt_jukebox.detect_tt_metal()
-        self.vllm_info = tt_jukebox.detect_tt_vllm()
-
-        # Fetch model specs
-        all_specs = tt_jukebox.fetch_model_specs()
-
-        if not all_specs:
-            self.notify("Failed to fetch model specifications", severity="error")
-            return
-
-        # Filter by hardware
-        if self.hardware:
-            validated, experimental = tt_jukebox.filter_by_hardware(
-                all_specs, self.hardware, include_experimental=True
-            )
-            self.all_specs = validated
-            self.experimental_specs = experimental
-        else:
-            # No hardware detected, show all
-            self.all_specs = all_specs
-            self.experimental_specs = []
+    The widget classes subclass textual types, so they are built here on first
+    use and published into module globals rather than at import time.
+    """
+    if "TTJukeboxTUI" in globals():
+        return
+
+    from textual.app import App, ComposeResult
+    from textual.containers import Container, Horizontal, Vertical, VerticalScroll
+    from textual.widgets import (
+        Header, Footer, Button, Static, DataTable, Input,
+        Label, TabbedContent, TabPane, Log, Tree, RichLog
+    )
+    from textual.binding import Binding
+    from textual.reactive import reactive
+    from textual import on, work
+    from rich.text import Text
+    from rich.table import Column, Table as RichTable
+    from rich.panel import Panel
+    from rich.console import Console
 
-        self.filtered_specs = self.all_specs[:]
+    # ============================================================================
+    # Custom Widgets
+    # ============================================================================
+
+    def new_grid(columns) -> RichTable:
+        """Build a grid from preconfigured columns (Column.copy() gives empty cells)."""
+        return RichTable.grid(*(column.copy() for column in columns), padding=(0, 2))
+
+    # The model table's Match cell only ever shows one of these two values
+    _MATCH_OK = Text("✓", style="green")
+    _MATCH_WARN = Text("⚠", style="yellow")
+
+    class HardwareStatusPanel(Static):
+        """Display current hardware and firmware information."""
+
+        def __init__(self):
+            super().__init__()
+            self.hardware = None
+            self.firmware = None
+            # False until the app's load worker reports its probe results
+            self.detected = False
+            self._grid_columns = (
+                Column(style=_STYLES['title_cyan']),
+                Column(style=TT_COLORS['text']),
+            )
 
-    def setup_table(self):
-        """Setup the model table columns and data."""
-        table = self.query_one("#model-table", DataTable)
-        table.cursor_type = "row"
+        def on_mount(self) -> None:
+            """Show a placeholder; load_data_worker supplies the detection results."""
+            self.refresh_display()
+
+        def update_hardware_info(self, hardware: Optional[str], firmware: Optional[str]):
+            """Show hardware and firmware detected by the app's load worker."""
+            self.hardware = hardware
+            self.firmware = firmware
+            self.detected = True
+            self.refresh_display()
+
+        def refresh_display(self):
+            """Update the display with current hardware info."""
+            table = new_grid(self._grid_columns)
+
+            if not self.detected:
+                # Probes still running in the app's load worker
+                for label in ("Hardware:", "Firmware:", "Status:"):
+                    table.add_row(label, _STYLES['detecting'])
+            else:
+                # Hardware
+                if self.hardware:
+                    table.add_row("Hardware:", f"[bold]{self.hardware}[/bold]")
+                else:
+                    table.add_row("Hardware:", _STYLES['hw_not_detected'])
+
+                # Firmware
+                if self.firmware:
+                    table.add_row("Firmware:", self.firmware)
+                else:
+                    table.add_row("Firmware:", _STYLES['fw_unknown'])
+
+                # Status
+                status = _STYLES['status_ready'] if self.hardware else _STYLES['status_no_hw']
+                table.add_row("Status:", status)
+
+            panel = Panel(
+                table,
+                title="[bold]Hardware Status[/bold]",
+                border_style=TT_COLORS['primary_cyan'],
+                padding=(1, 2)
+            )
+            self.update(panel)
 
-        # Add columns
-        table.add_column("Model", key="model")
-        table.add_column("Device", key="device")
-        table.add_column("Version", key="version")
-        table.add_column("Match", key="match")
 
-        # Populate rows
-        self.refresh_table()
+    class EnvironmentPanel(Static):
+        """Display current tt-metal and vLLM installation information."""
 
-    def refresh_table(self):
-        """Refresh table with filtered specs."""
-        table = self.query_one("#model-table", DataTable)
-        table.clear()
+        def __init__(self):
+            super().__init__()
+            self.metal_info = None
+            self.vllm_info = None
+            # False until the app's load worker reports its probe results
+            self.detected = False
+            self._grid_columns = (
+                Column(style=_STYLES['title_lcyan']),
+                Column(style=TT_COLORS['text']),
+            )
 
-        for spec in self.filtered_specs:
-            # Check environment match
-            env_match = tt_jukebox.check_environment_match(
-                spec, self.metal_info, self.vllm_info
+        def on_mount(self) -> None:
+            """Show a placeholder; load_data_worker supplies the detection results."""
+            self.refresh_display()
+
+        def update_environment_info(self, metal_info: Optional[Dict], vllm_info: Optional[Dict]):
+            """Show the tt-metal/vLLM installs detected by the app's load worker."""
+            self.metal_info = metal_info
+            self.vllm_info = vllm_info
+            self.detected = True
+            self.refresh_display()
+
+        def refresh_display(self):
+            """Update the display with current environment info."""
+            table = new_grid(self._grid_columns)
+
+            if not self.detected:
+                # Probes still running in the app's load worker
+                table.add_row("tt-metal:", _STYLES['detecting'])
+                table.add_row("vLLM:", _STYLES['detecting'])
+            else:
+                # tt-metal
+                if self.metal_info:
+                    commit = self.metal_info.get('commit', 'unknown')[:7]
+                    path = self.metal_info.get('path', 'unknown')
+                    table.add_row("tt-metal:", f"{commit} at {path}")
+                else:
+                    table.add_row("tt-metal:", _STYLES['not_installed'])
+
+                # vLLM
+                if self.vllm_info:
+                    commit = self.vllm_info.get('commit', 'unknown')[:7]
+                    path = self.vllm_info.get('path', 'unknown')
+                    table.add_row("vLLM:", f"{commit} at {path}")
+                else:
+                    table.add_row("vLLM:", _STYLES['not_installed'])
+
+            # Python
+            python_version, _ = tt_jukebox.check_python_version()
+            table.add_row("Python:", python_version)
+
+            panel = Panel(
+                table,
+                title="[bold]Environment[/bold]",
+                border_style=TT_COLORS['light_cyan'],
+                padding=(1, 2)
             )
+            self.update(panel)
+
 
-            match_indicator = "✓" if env_match.get('overall_match') else "⚠"
-            match_style = "green" if env_match.get('overall_match') else "yellow"
+    class ModelDetailPanel(Static):
+        """Display detailed information about a selected model."""
+
+        def __init__(self):
+            super().__init__("")
+            self.current_spec = None
+
+        def show_model(self, spec: Dict[str, Any], env_match: Optional[Dict] = None):
+            """Display model specification details."""
+            self.current_spec = spec
+
+            # Basic info, commits
+            sections = [_DETAIL_SUMMARY_TMPL.format_map(_SafeDict(spec, missing="Unknown"))]
+
+            # Device Specs
+            if 'device_model_spec' in spec:
+                sections.append(
+                    _DETAIL_DEVICE_CONFIG_TMPL.format_map(_SafeDict(spec['device_model_spec']))
+                )
 
-            table.add_row(
-                spec.get('model_name', 'Unknown'),
-                spec.get('device_type', 'Unknown'),
-                spec.get('version', 'Unknown'),
-                Text(match_indicator, style=match_style),
-                key=str(id(spec))
+            # Resource Requirements
+            sections.append(_DETAIL_REQUIREMENTS_TMPL.format_map(_SafeDict(spec)))
+
+            # Model Info
+            if 'hf_model_repo' in spec:
+                sections.append(f"[bold]HuggingFace:[/] {spec['hf_model_repo']}")
+
+            # Environment Match Status
+            if env_match:
+                lines = ["", _DETAIL_ENV_MATCH_HEADER]
+                if env_match.get('overall_match', False):
+                    lines.append(_STYLES['env_matches'])
+                else:
+                    lines.append(_STYLES['setup_required'])
+
+                    if not env_match.get('metal_match'):
+                        lines.append(f"  tt-metal: {env_match.get('metal_required', 'Unknown')}")
+
+                    if not env_match.get('vllm_match'):
+                        lines.append(f"  vLLM: {env_match.get('vllm_required', 'Unknown')}")
+                sections.append("\n".join(lines))
+
+            content = "\n".join(sections)
+            panel = Panel(
+                content,
+                title="[bold]Model Details[/bold]",
+                border_style=TT_COLORS['primary_cyan'],
+                padding=(1, 2)
             )
+            self.update(panel)
+
+        def clear(self):
+            """Clear the detail panel."""
+            self.current_spec = None
+            panel = Panel(
+                "[dim]Select a model to view details[/dim]",
+                title="[bold]Model Details[/bold]",
+                border_style=TT_COLORS['muted'],
+                padding=(1, 2)
+            )
+            self.update(panel)
+
+
+    class CommandPreviewPanel(Static):
+        """Display the vLLM command for the selected model."""
+
+        def __init__(self):
+            super().__init__()
+            self.current_command = None
+            # Rendered Syntax objects keyed by command text, oldest first
+            self._syntax_cache: Dict[str, Any] = {}
+
+        def on_mount(self) -> None:
+            """Render the placeholder once mounted."""
+            self.clear()
+
+        def show_command(self, spec: Dict[str, Any], model_info: Dict[str, str]):
+            """Display formatted vLLM command."""
+            commands = tt_jukebox.format_cli_command(spec, model_info)
+            self.current_command = commands.get('run', '')
+
+            # Format the command nicely (pygments theme/lexer load on first use)
+            syntax = self._syntax_cache.pop(self.current_command, None)
+            if syntax is None:
+                from rich.syntax import Syntax
+                syntax = Syntax(
+                    self.current_command,
+                    "bash",
+                    theme="monokai",
+                    line_numbers=False,
+                    word_wrap=True
+                )
+                if len(self._syntax_cache) >= _SYNTAX_CACHE_SIZE:
+                    del self._syntax_cache[next(iter(self._syntax_cache))]
+            self._syntax_cache[self.current_command] = syntax
+
+            panel = Panel(
+                syntax,
+                title="[bold]vLLM Server Command[/bold]",
+                subtitle="[dim]Press Ctrl+C to copy[/dim]",
+                border_style=TT_COLORS['success'],
+                padding=(1, 2)
+            )
+            self.update(panel)
+
+        def clear(self):
+            """Clear the command panel."""
+            self.current_command = None
+            panel = Panel(
+                "[dim]Select a model to see the command[/dim]",
+                title="[bold]vLLM Server Command[/bold]",
+                border_style=TT_COLORS['muted'],
+                padding=(1, 2)
+            )
+            self.update(panel)
+
+
+    # ============================================================================
+    # Main TUI Application
+    # ============================================================================
+
+    class TTJukeboxTUI(App):
+        """Main TUI application for TT-Jukebox."""
+
+        CSS = _CSS_TEMPLATE.format_map(TT_COLORS)
+
+        BINDINGS = [
+            Binding("q", "quit", "Quit", priority=True),
+            Binding("r", "refresh", "Refresh", priority=True),
+            Binding("s", "setup", "Setup", priority=True),
+            Binding("c", "copy_command", "Copy Command", priority=True),
+            Binding("h", "help", "Help", priority=True),
+            Binding("/", "focus_search", "Search", priority=True),
+            Binding("escape", "clear_search", "Clear Search", priority=True),
+        ]
+
+        TITLE = "TT-Jukebox - Interactive Model Manager"
+
+        # Reactive properties
+        search_query: reactive[str] = reactive("")
+        selected_spec: reactive[Optional[Dict]] = reactive(None)
+
+        def __init__(self):
+            super().__init__()
+            self.hardware = None
+            self.firmware = None
+            self.metal_info = None
+            self.vllm_info = None
+            self.all_specs = []
+            self.filtered_specs = []
+            self.experimental_specs = []
+            # Per-spec (row key, name, device, version) and lowercased search
+            # blob, both indexed like all_specs
+            self._rows: List[tuple] = []
+            self._search_blobs: List[str] = []
+            # all_specs indices of filtered_specs, and the query that produced them
+            self._filtered_idx: List[int] = []
+            self._last_query = ""
+            self._filter_timer = None
+            # Row keys currently in the model table; None forces a full rebuild
+            self._visible_keys: Optional[set] = None
+            # check_environment_match results by id(spec), reset by apply_data
+            self._env_match_cache: Dict[int, Dict] = {}
+
+        def compose(self) -> ComposeResult:
+            """Create the UI layout."""
+            yield Header()
+
+            with Horizontal():
+                # Left column: Status and model browser
+                with Vertical():
+                    with Container(id="status-panel"):
+                        yield HardwareStatusPanel()
+                        yield EnvironmentPanel()
+
+                    with Container(id="search-container"):
+                        yield Label("Search models:")
+                        yield Input(placeholder="Type to filter models...", id="search-input")
+
+                    yield DataTable(id="model-table")
+
+                # Right column: Details and command
+                with Vertical(id="detail-column"):
+                    yield ModelDetailPanel()
+                    with Container(id="command-panel"):
+                        yield CommandPreviewPanel()
+
+            yield Footer()
+
+        def on_mount(self) -> None:
+            """Initialize the application on mount."""
+            self.load_data_worker()
+
+        @work(exclusive=True, thread=True)
+        def load_data_worker(self, refresh: bool = False) -> None:
+            """Run load_data off the event loop, then apply its results on the loop."""
+            self.call_from_thread(self.apply_data, self.load_data())
+
+            if refresh:
+                self.call_from_thread(self.notify, "Data refreshed", severity="information")
+
+        def refresh_panels(self) -> None:
+            """Show the worker's probe results in the status panels."""
+            self.query_one(HardwareStatusPanel).update_hardware_info(self.hardware, self.firmware)
+            self.query_one(EnvironmentPanel).update_environment_info(self.metal_info, self.vllm_info)
+
+        def load_data(self) -> Dict[str, Any]:
+            """
+            Load hardware info and model specs (runs in load_data_worker's thread).
+
+            Only locals are built here; apply_data installs them on the event
+            loop, so filter_specs and refresh_table never see a half-built load.
+            This worker is also the only caller of the hardware/environment
+            probes, so tt-smi and git never run twice concurrently.
+            """
+            # Hardware (tt-smi), environment (git) and model specs (HTTP) are
+            # independent I/O, so probe them concurrently. Firmware shares the
+            # hardware worker so both read one cached tt-smi run.
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                hw_future = executor.submit(
+                    lambda: (tt_jukebox.detect_hardware(), tt_jukebox.get_firmware_version())
+                )
+                metal_future = executor.submit(tt_jukebox.detect_tt_metal)
+                vllm_future = executor.submit(tt_jukebox.detect_tt_vllm)
+                specs_future = executor.submit(tt_jukebox.fetch_model_specs)
+
+            hardware, firmware = hw_future.result()
+            all_specs = specs_future.result()
+            data = {
+                'hardware': hardware,
+                'firmware': firmware,
+                'metal_info': metal_future.result(),
+                'vllm_info': vllm_future.result(),
+                'all_specs': None,
+            }
+
+            if not all_specs:
+                self.call_from_thread(
+                    self.notify, "Failed to fetch model specifications", severity="error"
+                )
+                return data
 
-    def filter_specs(self, query: str):
-        """Filter specs based on search query."""
-        if not query:
-            self.filtered_specs = self.all_specs[:]
-        else:
-            query_lower = query.lower()
-            self.filtered_specs = [
-                spec for spec in self.all_specs
-                if query_lower in spec.get('model_name', '').lower()
-                or query_lower in spec.get('device_type', '').lower()
-                or query_lower in spec.get('version', '').lower()
+            # Filter by hardware
+            if hardware:
+                validated, experimental = tt_jukebox.filter_by_hardware(
+                    all_specs, hardware, include_experimental=True
+                )
+            else:
+                # No hardware detected, show all
+                validated, experimental = all_specs, []
+
+            rows = [
+                (
+                    str(id(spec)),
+                    spec.get('model_name', 'Unknown'),
+                    spec.get('device_type', 'Unknown'),
+                    spec.get('version', 'Unknown'),
+                )
+                for spec in validated
+            ]
+
+            # Lowercased "name\0device\0version" per spec, searched by filter_specs
+            search_blobs = [
+                "\x00".join((
+                    spec.get('model_name', ''),
+                    spec.get('device_type', ''),
+                    spec.get('version', ''),
+                )).lower()
+                for spec in validated
             ]
 
-        self.refresh_table()
-
-    @on(Input.Changed, "#search-input")
-    def on_search_changed(self, event: Input.Changed):
-        """Handle search input changes."""
-        self.filter_specs(event.value)
-
-    @on(DataTable.RowSelected, "#model-table")
-    def on_row_selected(self, event: DataTable.RowSelected):
-        """Handle model selection in table."""
-        # Find the selected spec
-        row_index = event.cursor_row
-        if 0 <= row_index < len(self.filtered_specs):
-            spec = self.filtered_specs[row_index]
-            self.selected_spec = spec
-
-            # Update detail panel
-            detail_panel = self.query_one(ModelDetailPanel)
-            env_match = tt_jukebox.check_environment_match(
-                spec, self.metal_info, self.vllm_info
+            data.update(
+                all_specs=validated,
+                experimental_specs=experimental,
+                rows=rows,
+                search_blobs=search_blobs,
             )
-            detail_panel.show_model(spec, env_match)
-
-            # Update command panel
-            model_info = tt_jukebox.detect_model_download(spec)
-            if model_info:
-                command_panel = self.query_one(CommandPreviewPanel)
-                command_panel.show_command(spec, model_info)
-
-    def action_refresh(self):
-        """Refresh all data."""
-        self.notify("Refreshing data...")
-        self.load_data()
-        self.setup_table()
-
-        # Update panels
-        hw_panel = self.query_one(HardwareStatusPanel)
-        hw_panel.update_hardware_info()
-
-        env_panel = self.query_one(EnvironmentPanel)
-        env_panel.update_environment_info()
-
-        self.notify("Data refreshed", severity="information")
-
-    def action_setup(self):
-        """Setup the selected model environment."""
-        if not self.selected_spec:
-            self.notify("Please select a model first", severity="warning")
-            return
-
-        self.notify("Setup functionality coming soon!", severity="information")
-        # TODO: Implement setup with progress tracking
-
-    def action_copy_command(self):
-        """Copy the vLLM command to clipboard."""
-        command_panel = self.query_one(CommandPreviewPanel)
-        if command_panel.current_command:
-            # Try to copy to clipboard
-            try:
-                import subprocess
-                subprocess.run(
-                    ['pbcopy' if sys.platform == 'darwin' else 'xclip', '-selection', 'clipboard'],
-                    input=command_panel.current_command.encode(),
-                    check=True
+            return data
+
+        def apply_data(self, data: Dict[str, Any]) -> None:
+            """Install a load_data result and repopulate the table (event loop only)."""
+            self.hardware = data['hardware']
+            self.firmware = data['firmware']
+            self.metal_info = data['metal_info']
+            self.vllm_info = data['vllm_info']
+            self._env_match_cache.clear()
+            self.refresh_panels()
+
+            # Spec fetch failed: keep whatever the table already shows
+            if data['all_specs'] is None:
+                return
+
+            self.all_specs = data['all_specs']
+            self.experimental_specs = data['experimental_specs']
+            self._rows = data['rows']
+            self._search_blobs = data['search_blobs']
+
+            self.filtered_specs = self.all_specs[:]
+            self._filtered_idx = list(range(len(self.all_specs)))
+            self._last_query = ""
+            self._visible_keys = None
+            self.setup_table()
+
+        def setup_table(self):
+            """Setup the model table columns and data."""
+            table = self.query_one("#model-table", DataTable)
+            table.cursor_type = "row"
+
+            # Add columns (once; action_refresh calls this again)
+            if not table.columns:
+                table.add_column("Model", key="model")
+                table.add_column("Device", key="device")
+                table.add_column("Version", key="version")
+                table.add_column("Match", key="match")
+
+            # Populate rows
+            self.refresh_table()
+
+        def refresh_table(self):
+            """Sync the table with filtered specs, only touching rows that changed."""
+            table = self.query_one("#model-table", DataTable)
+            rows = self._rows
+            filtered_rows = [rows[i] for i in self._filtered_idx]
+            new_keys = [row[0] for row in filtered_rows]
+            visible = self._visible_keys
+
+            if visible is not None:
+                # Rows can only be appended, so rebuild when a returning row
+                # would have to land before one that is already shown
+                kept = [key for key in new_keys if key in visible]
+                if new_keys[:len(kept)] != kept:
+                    visible = None
+
+            if visible is None:
+                table.clear()
+                visible = set()
+            else:
+                new_key_set = set(new_keys)
+                for key in visible - new_key_set:
+                    table.remove_row(key)
+                visible &= new_key_set
+
+            # Bind hot-loop lookups once rather than per row
+            get_env_match = self.env_match
+            add_row = table.add_row
+            mark_visible = visible.add
+
+            for (key, name, device, version), spec in zip(filtered_rows, self.filtered_specs):
+                if key in visible:
+                    continue
+                mark_visible(key)
+
+                # Check environment match
+                env_match = get_env_match(spec)
+
+                match_cell = _MATCH_OK if env_match.get('overall_match') else _MATCH_WARN
+
+                add_row(name, device, version, match_cell, key=key)
+
+            self._visible_keys = visible
+
+        def env_match(self, spec: Dict[str, Any]) -> Dict:
+            """Return check_environment_match() for spec, computed once per load."""
+            env_match = self._env_match_cache.get(id(spec))
+            if env_match is None:
+                env_match = tt_jukebox.check_environment_match(
+                    spec, self.metal_info, self.vllm_info
                 )
-                self.notify("Command copied to clipboard!", severity="information")
-            except:
-                self.notify("Copy failed. Command:\n" + command_panel.current_command,
-                           severity="warning", timeout=10)
-        else:
-            self.notify("No command to copy", severity="warning")
-
-    def action_focus_search(self):
-        """Focus the search input."""
-        search_input = self.query_one("#search-input", Input)
-        search_input.focus()
-
-    def action_clear_search(self):
-        """Clear the search input."""
-        search_input = self.query_one("#search-input", Input)
-        search_input.value = ""
-        self.filter_specs("")
-
-    def action_help(self):
-        """Show help information."""
-        help_text = """
+                self._env_match_cache[id(spec)] = env_match
+            return env_match
+
+        def filter_specs(self, query: str):
+            """Filter specs based on search query."""
+            query_lower = query.strip().lower()
+            if query_lower == self._last_query:
+                return
+
+            all_specs = self.all_specs
+            if not query_lower:
+                self._filtered_idx = list(range(len(all_specs)))
+            else:
+                if self._last_query and query_lower.startswith(self._last_query):
+                    # Typing forward can only narrow the current matches
+                    candidates = self._filtered_idx
+                else:
+                    candidates = range(len(all_specs))
+                blobs = self._search_blobs
+                self._filtered_idx = [i for i in candidates if query_lower in blobs[i]]
+
+            self.filtered_specs = [all_specs[i] for i in self._filtered_idx]
+            self._last_query = query_lower
+            self.refresh_table()
+
+        @on(Input.Changed, "#search-input")
+        def on_search_changed(self, event: Input.Changed):
+            """Handle search input changes (debounced so bursts of typing filter once)."""
+            if self._filter_timer is not None:
+                self._filter_timer.stop()
+            self._filter_timer = self.set_timer(
+                _SEARCH_DEBOUNCE, lambda value=event.value: self.filter_specs(value)
+            )
+
+        @on(DataTable.RowSelected, "#model-table")
+        def on_row_selected(self, event: DataTable.RowSelected):
+            """Handle model selection in table."""
+            # Find the selected spec
+            row_index = event.cursor_row
+            if 0 <= row_index < len(self.filtered_specs):
+                spec = self.filtered_specs[row_index]
+                self.selected_spec = spec
+
+                # Update detail panel
+                detail_panel = self.query_one(ModelDetailPanel)
+                env_match = self.env_match(spec)
+                detail_panel.show_model(spec, env_match)
+
+                # Update command panel
+                model_info = tt_jukebox.detect_model_download(spec)
+                if model_info:
+                    command_panel = self.query_one(CommandPreviewPanel)
+                    command_panel.show_command(spec, model_info)
+
+        def action_refresh(self):
+            """Refresh all data."""
+            self.notify("Refreshing data...")
+            tt_jukebox.refresh_hardware()
+            self.load_data_worker(refresh=True)
+
+        def action_setup(self):
+            """Setup the selected model environment."""
+            if not self.selected_spec:
+                self.notify("Please select a model first", severity="warning")
+                return
+
+            self.notify("Setup functionality coming soon!", severity="information")
+            # TODO: Implement setup with progress tracking
+
+        def action_copy_command(self):
+            """Copy the vLLM command to clipboard."""
+            command_panel = self.query_one(CommandPreviewPanel)
+            command = command_panel.current_command
+            if command:
+                # A local clipboard tool reports whether the copy worked
+                clipboard = _clipboard_command()
+                if clipboard:
+                    try:
+                        subprocess.run(clipboard, input=command.encode(), check=True, timeout=5)
+                        self.notify("Command copied to clipboard!", severity="information")
+                        return
+                    except (OSError, subprocess.SubprocessError):
+                        pass
+
+                # Otherwise ask the terminal via OSC 52 (works over SSH). Terminals
+                # without OSC 52 ignore it silently, so show the command as well.
+                self.copy_to_clipboard(command)
+                self.notify("Sent to the terminal clipboard (needs OSC 52 support). Command:\n"
+                            + command, severity="information", timeout=10)
+            else:
+                self.notify("No command to copy", severity="warning")
+
+        def action_focus_search(self):
+            """Focus the search input."""
+            search_input = self.query_one("#search-input", Input)
+            search_input.focus()
+
+        def action_clear_search(self):
+            """Clear the search input."""
+            search_input = self.query_one("#search-input", Input)
+            search_input.value = ""
+            self.filter_specs("")
+
+        def action_help(self):
+            """Show help information."""
+            help_text = """
 [bold]TT-Jukebox TUI - Keyboard Shortcuts[/bold]
 
   q           Quit application
@@ -635,7 +905,23 @@ class TTJukeboxTUI(App):
 [bold]About:[/bold]
 Interactive terminal UI for managing Tenstorrent models and environments.
         """
-        self.notify(help_text.strip(), timeout=15)
+            self.notify(help_text.strip(), timeout=15)
+
+    globals().update(
+        HardwareStatusPanel=HardwareStatusPanel,
+        EnvironmentPanel=EnvironmentPanel,
+        ModelDetailPanel=ModelDetailPanel,
+        CommandPreviewPanel=CommandPreviewPanel,
+        TTJukeboxTUI=TTJukeboxTUI,
+    )
+
+
+def __getattr__(name: str):
+    """PEP 562 hook: build the TUI classes on first access from other modules."""
+    if name in _LAZY_NAMES:
+        _load_tui_deps()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ============================================================================
@@ -644,6 +930,13 @@ Interactive terminal UI for managing Tenstorrent models and environments.
 
 def main():
     """Run the TUI application."""
+    if missing_tui_dependencies():
+        print("Error: TUI dependencies not installed.")
+        print("Please install with: pip install -r requirements-tui.txt")
+        print("Or: pip install 'textual>=0.47.0' 'rich>=13.7.0'")
+        sys.exit(1)
+
+    _load_tui_deps()
     app = TTJukeboxTUI()
     app.run()
 
@@ -21,24 +21,43 @@ Version: 1.0.0
 """
 
 import argparse
+import collections
 import datetime
+import functools
 import json
 import logging
+import mmap
 import os
 import re
+import shlex
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from urllib.request import urlopen
 
+# Optional: orjson parses the model specs payload several times faster.
+# The CLI stays stdlib-only; stdlib json is used when it isn't installed.
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Whether prompts can be answered interactively (checked once; stdin is None when detached)
+_STDIN_IS_TTY = sys.stdin is not None and sys.stdin.isatty()
+
 # Setup logging
 LOG_DIR = Path.home() / 'tt-scratchpad' / 'logs'
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 LOG_FILE = LOG_DIR / f'tt-jukebox-{datetime.datetime.now().strftime("%Y%m%d-%H%M%S")}.log'
 
+# Set TT_JUKEBOX_DEBUG=1 to also record DEBUG-level messages in the log file
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=logging.DEBUG if os.environ.get('TT_JUKEBOX_DEBUG') else logging.INFO,
     format='%(asctime)s [%(levelname)s] %(message)s',
     handlers=[
         logging.FileHandler(LOG_FILE),
@@ -59,61 +78,176 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
+# Per-severity prefixes, built once since the Colors codes are constants
+_PREFIX_SUCCESS = f"{Colors.OKGREEN}✓ "
+_PREFIX_INFO = f"{Colors.OKCYAN}ℹ "
+_PREFIX_WARNING = f"{Colors.WARNING}⚠ "
+_PREFIX_ERROR = f"{Colors.FAIL}✗ "
+_SUFFIX = f"{Colors.ENDC}\n"
+_HEADER_RULE = f"{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}"
+
+# List badges for the known statuses
+_STATUS_BADGE = {
+    'EXPERIMENTAL': f' [{Colors.WARNING}EXPERIMENTAL{Colors.ENDC}]',
+    'FUNCTIONAL': f' [{Colors.OKCYAN}FUNCTIONAL{Colors.ENDC}]',
+    'COMPLETE': f' [{Colors.OKGREEN}COMPLETE{Colors.ENDC}]',
+}
+
+def _emit(prefix: str, text: str, buf: Optional[List[str]] = None):
+    # With buf, the line is collected for the caller to write in one go
+    if buf is None:
+        sys.stdout.write(prefix + text + _SUFFIX)
+    else:
+        buf.append(prefix + text + _SUFFIX)
+
 def print_header(text: str):
-    logger.info(f"HEADER: {text}")
-    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{text}{Colors.ENDC}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{'='*70}{Colors.ENDC}\n")
+    logger.info("HEADER: %s", text)
+    sys.stdout.write(f"\n{_HEADER_RULE}\n{Colors.HEADER}{Colors.BOLD}{text}{Colors.ENDC}\n{_HEADER_RULE}\n\n")
 
-def print_success(text: str):
-    logger.info(f"SUCCESS: {text}")
-    print(f"{Colors.OKGREEN}✓ {text}{Colors.ENDC}")
+def print_success(text: str, buf: Optional[List[str]] = None):
+    logger.info("SUCCESS: %s", text)
+    _emit(_PREFIX_SUCCESS, text, buf)
 
-def print_info(text: str):
+def print_info(text: str, buf: Optional[List[str]] = None):
     logger.info(text)
-    print(f"{Colors.OKCYAN}ℹ {text}{Colors.ENDC}")
+    _emit(_PREFIX_INFO, text, buf)
 
-def print_warning(text: str):
+def print_warning(text: str, buf: Optional[List[str]] = None):
     logger.warning(text)
-    print(f"{Colors.WARNING}⚠ {text}{Colors.ENDC}")
+    _emit(_PREFIX_WARNING, text, buf)
 
-def print_error(text: str):
+def print_error(text: str, buf: Optional[List[str]] = None):
     logger.error(text)
-    print(f"{Colors.FAIL}✗ {text}{Colors.ENDC}")
+    _emit(_PREFIX_ERROR, text, buf)
 
 
 # ============================================================================
-# Hardware Detection
+# Detection Cache
 # ============================================================================
 
-def detect_hardware() -> Optional[str]:
+# detect_* results persisted across runs; cleared by refresh_hardware()
+ENV_CACHE_FILE = Path.home() / 'tt-scratchpad' / 'cache' / 'env.json'
+HW_CACHE_TTL = 300        # Hardware/firmware: 5 minutes
+INSTALL_CACHE_TTL = 900   # tt-metal/tt-vllm installs: 15 minutes
+
+_ENV_CACHE_LOCK = threading.Lock()  # The TUI runs detections concurrently
+
+
+def _read_env_cache() -> Dict:
+    try:
+        with open(ENV_CACHE_FILE, 'r') as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def persistent_cache(key: str, ttl: int, fingerprint=None, replay=None):
     """
-    Detect Tenstorrent hardware using tt-smi.
-    Returns device type (N150, N300, T3K, etc.) or None if not found.
+    Decorator: persist a detect_* result in ENV_CACHE_FILE for ttl seconds so
+    later runs skip the tt-smi/git subprocesses. None (nothing detected) is
+    never cached.
+
+    fingerprint(), if given, returns a JSON-able snapshot of what the result
+    depends on (e.g. repo path and HEAD); a cached result is only used while
+    the snapshot still matches, and nothing is cached while it returns None.
+    replay(value), if given, prints the messages the skipped detection would have.
     """
-    print_info("Detecting Tenstorrent hardware...")
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper():
+            entry = _read_env_cache().get(key)
+            if isinstance(entry, dict) and time.time() - entry.get('time', 0) < ttl:
+                current = fingerprint() if fingerprint else None
+                if fingerprint is None or (current is not None and entry.get('fingerprint') == current):
+                    logger.info("Using cached %s detection", key)
+                    value = entry.get('value')
+                    if replay is not None:
+                        replay(value)
+                    return value
+
+            value = fn()
+            current = fingerprint() if fingerprint else None
+            if value is not None and (fingerprint is None or current is not None):
+                with _ENV_CACHE_LOCK:
+                    data = _read_env_cache()
+                    data[key] = {'value': value, 'time': time.time(), 'fingerprint': current}
+                    tmp_file = ENV_CACHE_FILE.with_suffix('.json.tmp')
+                    try:
+                        ENV_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+                        with open(tmp_file, 'w') as f:
+                            json.dump(data, f)
+                        os.replace(tmp_file, ENV_CACHE_FILE)
+                    except (OSError, TypeError) as e:
+                        logger.warning("Failed to write detection cache: %s", e)
+                        try:
+                            tmp_file.unlink()
+                        except OSError:
+                            pass
+            return value
+        return wrapper
+    return decorator
 
-    try:
+
+# ============================================================================
+# Hardware Detection
+# ============================================================================
+
+# Combined stdout+stderr of `tt-smi -s`, shared by detect_hardware() and
+# get_firmware_version() so one session runs tt-smi once
+_TTSMI_CACHE: Optional[str] = None
+
+# tt-smi output patterns
+_BOARD_RE = re.compile(r'([NP]\d+)')               # "N300 L" -> N300
+_BOARD_FALLBACK_RE = re.compile(r'[nNpP](\d+)')    # text output, any case
+_FW_RE = re.compile(r'(\d+\.\d+\.\d+)')
+
+
+def _get_tt_smi_output() -> str:
+    """
+    Run `tt-smi -s` on first use and return its combined output.
+    Errors (FileNotFoundError, TimeoutExpired) propagate and are not cached.
+    """
+    global _TTSMI_CACHE
+    if _TTSMI_CACHE is None:
         result = subprocess.run(
             ['tt-smi', '-s'],
             capture_output=True,
             text=True,
             timeout=10
         )
+        _TTSMI_CACHE = result.stdout + result.stderr
+    return _TTSMI_CACHE
+
+
+def _replay_hardware(device_type: str):
+    print_info("Detecting Tenstorrent hardware...")
+    print_success(f"Detected: {device_type}")
+
+
+@functools.lru_cache(maxsize=1)
+@persistent_cache('hardware', HW_CACHE_TTL, replay=_replay_hardware)
+def detect_hardware() -> Optional[str]:
+    """
+    Detect Tenstorrent hardware using tt-smi.
+    Returns device type (N150, N300, T3K, etc.) or None if not found.
+    """
+    print_info("Detecting Tenstorrent hardware...")
 
-        output = result.stdout + result.stderr
+    try:
+        output = _get_tt_smi_output()
 
-        # Try to parse JSON format
+        # Try to parse JSON format, decoding in one pass from the first brace
         try:
-            json_match = re.search(r'\{[\s\S]*\}', output)
-            if json_match:
-                data = json.loads(json_match.group(0))
+            json_start = output.find('{')
+            if json_start >= 0:
+                data, _ = json.JSONDecoder().raw_decode(output, json_start)
                 if 'device_info' in data and len(data['device_info']) > 0:
                     device = data['device_info'][0]
                     if 'board_info' in device and 'board_type' in device['board_info']:
                         board_type = device['board_info']['board_type'].upper()
                         # Extract device model (N150, N300, etc.)
-                        match = re.search(r'([NP]\d+)', board_type)
+                        match = _BOARD_RE.search(board_type)
                         if match:
                             device_type = match.group(1)
                             print_success(f"Detected: {device_type}")
@@ -124,7 +258,7 @@ def detect_hardware() -> Optional[str]:
         # Fallback: text parsing
         for line in output.split('\n'):
             if 'Board Type:' in line or 'board_type' in line:
-                match = re.search(r'[nNpP](\d+)', line)
+                match = _BOARD_FALLBACK_RE.search(line)
                 if match:
                     device_type = f"N{match.group(1)}"
                     print_success(f"Detected: {device_type}")
@@ -144,22 +278,17 @@ def detect_hardware() -> Optional[str]:
         return None
 
 
+@functools.lru_cache(maxsize=1)
+@persistent_cache('firmware', HW_CACHE_TTL)
 def get_firmware_version() -> Optional[str]:
     """Get firmware version from tt-smi."""
     try:
-        result = subprocess.run(
-            ['tt-smi', '-s'],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-
-        output = result.stdout + result.stderr
+        output = _get_tt_smi_output()
 
         # Look for firmware version
         for line in output.split('\n'):
             if 'fw_bundle_version' in line or 'FW Version:' in line or 'Firmware Version:' in line:
-                match = re.search(r'(\d+\.\d+\.\d+)', line)
+                match = _FW_RE.search(line)
                 if match:
                     return match.group(1)
 
@@ -172,6 +301,83 @@ def get_firmware_version() -> Optional[str]:
 # Environment Detection
 # ============================================================================
 
+def _git_head_info(path: Path) -> Tuple[str, str]:
+    """
+    Return (short commit, branch) for the repo at path using a single git call.
+    Branch is '(detached HEAD)' when HEAD doesn't point at a branch.
+    """
+    result = subprocess.run(
+        ['git', 'log', '-1', '--format=%h%n%D'],
+        cwd=path,
+        capture_output=True,
+        text=True
+    )
+    commit, _, refs = result.stdout.strip().partition('\n')
+
+    # %D lists "HEAD -> branch, ..." on a branch and "HEAD, ..." when detached
+    head = refs.split(', ', 1)[0]
+    if head.startswith('HEAD -> '):
+        branch = head[len('HEAD -> '):]
+    else:
+        branch = '(detached HEAD)' if head else ''
+    return commit, branch
+
+
+def _sha7(commit: Optional[str]) -> str:
+    """Normalize a commit to its 7-char prefix ('' when missing) for == comparison."""
+    return (commit or '')[:7]
+
+
+def _first_git_repo(paths: List[Path]) -> Optional[Path]:
+    """Return the first of paths that is a git checkout, or None."""
+    for path in paths:
+        # One stat: a missing path and a non-git directory both raise OSError
+        try:
+            (path / '.git').stat()
+        except OSError:
+            continue
+        return path
+    return None
+
+
+def _git_head_sha(path: Path) -> Optional[str]:
+    """
+    Resolve HEAD of the repo at path by reading .git directly (no git process).
+    Returns None when it can't be resolved (e.g. worktrees, unusual layouts).
+    """
+    git_dir = path / '.git'
+    try:
+        head = (git_dir / 'HEAD').read_text().strip()
+    except OSError:
+        return None
+    if not head.startswith('ref: '):
+        return head  # Detached HEAD holds the sha itself
+
+    ref = head[len('ref: '):]
+    try:
+        return (git_dir / ref).read_text().strip()
+    except OSError:
+        pass
+    try:
+        with open(git_dir / 'packed-refs', 'r') as f:
+            for line in f:
+                sha, _, name = line.rstrip('\n').partition(' ')
+                if name == ref:
+                    return sha
+    except OSError:
+        pass
+    return None
+
+
+def _repo_fingerprint(paths: List[Path]) -> Optional[List[str]]:
+    """[repo path, HEAD sha] of the first checkout among paths; None if there is none."""
+    path = _first_git_repo(paths)
+    if path is None:
+        return None
+    sha = _git_head_sha(path)
+    return [str(path), sha] if sha else None
+
+
 def install_tt_metal() -> Optional[Dict[str, str]]:
     """
     Clone and install tt-metal if not found.
@@ -198,25 +404,12 @@ def install_tt_metal() -> Optional[Dict[str, str]]:
         print_success("✓ tt-metal cloned")
 
         # Get commit info
-        result = subprocess.run(
-            ['git', 'rev-parse', '--short', 'HEAD'],
-            cwd=install_path,
-            capture_output=True,
-            text=True
-        )
-        commit = result.stdout.strip()
-
-        result = subprocess.run(
-            ['git', 'branch', '--show-current'],
-            cwd=install_path,
-            capture_output=True,
-            text=True
-        )
-        branch = result.stdout.strip()
+        commit, branch = _git_head_info(install_path)
 
         return {
             'path': str(install_path),
             'commit': commit,
+            'sha7': _sha7(commit),
             'version': commit,
             'branch': branch
         }
@@ -226,14 +419,8 @@ def install_tt_metal() -> Optional[Dict[str, str]]:
         return None
 
 
-def detect_tt_metal() -> Optional[Dict[str, str]]:
-    """
-    Detect tt-metal installation and version.
-    Automatically installs if not found.
-    Returns dict with path, commit, version, or None if installation fails.
-    """
-    print_info("Checking tt-metal installation...")
-
+def _tt_metal_paths() -> List[Path]:
+    """Locations checked for tt-metal, TT_METAL_HOME first when set."""
     # Check common locations
     possible_paths = [
         Path.home() / 'tt-metal',
@@ -244,66 +431,65 @@ def detect_tt_metal() -> Optional[Dict[str, str]]:
     # Also check TT_METAL_HOME env var
     if 'TT_METAL_HOME' in os.environ:
         possible_paths.insert(0, Path(os.environ['TT_METAL_HOME']))
+    return possible_paths
+
+
+def _report_tt_metal(info: Dict[str, str]):
+    path = info['path']
+    if info.get('commit') is None:
+        print_warning(f"Found tt-metal at {path} but couldn't get git info")
+        return
+    print_success(f"Found tt-metal at {path}")
+    print_info(f"  Branch: {info['branch']}, Commit: {info['commit']}, Version: {info['version']}")
+
+
+def _replay_tt_metal(info: Dict[str, str]):
+    print_info("Checking tt-metal installation...")
+    _report_tt_metal(info)
 
-    for path in possible_paths:
-        if path.exists() and (path / '.git').exists():
-            try:
-                # Get git commit
-                result = subprocess.run(
-                    ['git', 'rev-parse', '--short', 'HEAD'],
-                    cwd=path,
-                    capture_output=True,
-                    text=True
-                )
-                commit = result.stdout.strip()
-
-                # Try to get version tag
-                result = subprocess.run(
-                    ['git', 'describe', '--tags', '--always'],
-                    cwd=path,
-                    capture_output=True,
-                    text=True
-                )
-                version = result.stdout.strip()
-
-                # Get branch name (handle detached HEAD state)
-                result = subprocess.run(
-                    ['git', 'branch', '--show-current'],
-                    cwd=path,
-                    capture_output=True,
-                    text=True
-                )
-                branch = result.stdout.strip()
-
-                # If empty (detached HEAD), try to get symbolic ref
-                if not branch:
-                    result = subprocess.run(
-                        ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
-                        cwd=path,
-                        capture_output=True,
-                        text=True
-                    )
-                    branch_or_head = result.stdout.strip()
-                    if branch_or_head == 'HEAD':
-                        branch = '(detached HEAD)'
-                    else:
-                        branch = branch_or_head
-
-                info = {
-                    'path': str(path),
-                    'commit': commit,
-                    'version': version,
-                    'branch': branch
-                }
-
-                print_success(f"Found tt-metal at {path}")
-                print_info(f"  Branch: {branch}, Commit: {commit}, Version: {version}")
-
-                return info
-
-            except Exception as e:
-                print_warning(f"Found tt-metal at {path} but couldn't get git info: {e}")
-                return {'path': str(path), 'commit': None, 'version': None, 'branch': None}
+
+@functools.lru_cache(maxsize=1)
+@persistent_cache('tt_metal', INSTALL_CACHE_TTL,
+                  fingerprint=lambda: _repo_fingerprint(_tt_metal_paths()),
+                  replay=_replay_tt_metal)
+def detect_tt_metal() -> Optional[Dict[str, str]]:
+    """
+    Detect tt-metal installation and version.
+    Automatically installs if not found.
+    Returns dict with path, commit, version, or None if installation fails.
+    """
+    print_info("Checking tt-metal installation...")
+
+    path = _first_git_repo(_tt_metal_paths())
+    if path is not None:
+        try:
+            # Get git commit and branch (handles detached HEAD state)
+            commit, branch = _git_head_info(path)
+
+            # Try to get version tag
+            result = subprocess.run(
+                ['git', 'describe', '--tags', '--always'],
+                cwd=path,
+                capture_output=True,
+                text=True
+            )
+            version = result.stdout.strip()
+
+            info = {
+                'path': str(path),
+                'commit': commit,
+                'sha7': _sha7(commit),
+                'version': version,
+                'branch': branch
+            }
+
+            _report_tt_metal(info)
+
+            return info
+
+        except Exception as e:
+            print_warning(f"Found tt-metal at {path} but couldn't get git info: {e}")
+            return {'path': str(path), 'commit': None, 'sha7': '', 'version': None, 'branch': None}
 
     print_warning("tt-metal not found - will install automatically")
     return install_tt_metal()
@@ -335,25 +521,12 @@ def install_tt_vllm() -> Optional[Dict[str, str]]:
         print_success("✓ tt-vllm cloned")
 
         # Get commit info
-        result = subprocess.run(
-            ['git', 'rev-parse', '--short', 'HEAD'],
-            cwd=install_path,
-            capture_output=True,
-            text=True
-        )
-        commit = result.stdout.strip()
-
-        result = subprocess.run(
-            ['git', 'branch', '--show-current'],
-            cwd=install_path,
-            capture_output=True,
-            text=True
-        )
-        branch = result.stdout.strip()
+        commit, branch = _git_head_info(install_path)
 
         return {
             'path': str(install_path),
             'commit': commit,
+            'sha7': _sha7(commit),
             'branch': branch
         }
 
@@ -362,6 +535,34 @@ def install_tt_vllm() -> Optional[Dict[str, str]]:
         return None
 
 
+def _tt_vllm_paths() -> List[Path]:
+    """Locations checked for tt-vllm."""
+    # Check common locations
+    return [
+        Path.home() / 'tt-vllm',
+        Path.home() / 'vllm',
+        Path.home() / 'tenstorrent' / 'vllm',
+    ]
+
+
+def _report_tt_vllm(info: Dict[str, str]):
+    path = info['path']
+    if info.get('commit') is None:
+        print_warning(f"Found tt-vllm at {path} but couldn't get git info")
+        return
+    print_success(f"Found tt-vllm at {path}")
+    print_info(f"  Branch: {info['branch']}, Commit: {info['commit']}")
+
+
+def _replay_tt_vllm(info: Dict[str, str]):
+    print_info("Checking tt-vllm installation...")
+    _report_tt_vllm(info)
+
+
+@functools.lru_cache(maxsize=1)
+@persistent_cache('tt_vllm', INSTALL_CACHE_TTL,
+                  fingerprint=lambda: _repo_fingerprint(_tt_vllm_paths()),
+                  replay=_replay_tt_vllm)
 def detect_tt_vllm() -> Optional[Dict[str, str]]:
     """
     Detect tt-vllm installation and version.
@@ -370,67 +571,32 @@ def detect_tt_vllm() -> Optional[Dict[str, str]]:
     """
     print_info("Checking tt-vllm installation...")
 
-    # Check common locations
-    possible_paths = [
-        Path.home() / 'tt-vllm',
-        Path.home() / 'vllm',
-        Path.home() / 'tenstorrent' / 'vllm',
-    ]
+    path = _first_git_repo(_tt_vllm_paths())
+    if path is not None:
+        try:
+            # Get git commit and branch (handles detached HEAD state)
+            commit, branch = _git_head_info(path)
+
+            info = {
+                'path': str(path),
+                'commit': commit,
+                'sha7': _sha7(commit),
+                'branch': branch
+            }
 
-    for path in possible_paths:
-        if path.exists() and (path / '.git').exists():
-            try:
-                # Get git commit
-                result = subprocess.run(
-                    ['git', 'rev-parse', '--short', 'HEAD'],
-                    cwd=path,
-                    capture_output=True,
-                    text=True
-                )
-                commit = result.stdout.strip()
-
-                # Get branch name (handle detached HEAD state)
-                result = subprocess.run(
-                    ['git', 'branch', '--show-current'],
-                    cwd=path,
-                    capture_output=True,
-                    text=True
-                )
-                branch = result.stdout.strip()
-
-                # If empty (detached HEAD), try to get symbolic ref
-                if not branch:
-                    result = subprocess.run(
-                        ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
-                        cwd=path,
-                        capture_output=True,
-                        text=True
-                    )
-                    branch_or_head = result.stdout.strip()
-                    if branch_or_head == 'HEAD':
-                        branch = '(detached HEAD)'
-                    else:
-                        branch = branch_or_head
-
-                info = {
-                    'path': str(path),
-                    'commit': commit,
-                    'branch': branch
-                }
-
-                print_success(f"Found tt-vllm at {path}")
-                print_info(f"  Branch: {branch}, Commit: {commit}")
-
-                return info
-
-            except Exception as e:
-                print_warning(f"Found tt-vllm at {path} but couldn't get git info: {e}")
-                return {'path': str(path), 'commit': None, 'branch': None}
+            _report_tt_vllm(info)
+
+            return info
+
+        except Exception as e:
+            print_warning(f"Found tt-vllm at {path} but couldn't get git info: {e}")
+            return {'path': str(path), 'commit': None, 'sha7': '', 'branch': None}
 
     print_warning("tt-vllm not found - will install automatically")
     return install_tt_vllm()
 
 
+@functools.lru_cache(maxsize=1)
 def check_python_version() -> Tuple[str, bool]:
     """Check Python version. Returns (version_string, is_compatible)."""
     version = sys.version_info
@@ -439,17 +605,88 @@ def check_python_version() -> Tuple[str, bool]:
     return version_str, is_compatible
 
 
+def refresh_hardware():
+    """
+    Clear cached hardware/environment detection results (including model
+    download status), in memory and on disk.
+    The next detect_* call re-runs tt-smi and git instead of reusing a cached result.
+    """
+    global _TTSMI_CACHE
+    _TTSMI_CACHE = None
+    with _ENV_CACHE_LOCK:
+        try:
+            ENV_CACHE_FILE.unlink()
+        except FileNotFoundError:
+            pass
+    for fn in (detect_hardware, get_firmware_version, detect_tt_metal,
+               detect_tt_vllm, check_python_version):
+        fn.cache_clear()
+    _MODEL_PATH_CACHE.clear()
+
+
 # ============================================================================
 # Model Specs Fetching
 # ============================================================================
 
+def _load_json_file(path: Path):
+    """
+    Parse a JSON file. With orjson, parse straight from a read-only mmap of the
+    file instead of copying it into a bytes object first.
+    """
+    with open(path, 'rb') as f:
+        if _json_loads is json.loads:
+            return json.loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            return _json_loads(view)
+
+
+def _prepare_specs(specs: List[Dict]) -> List[Dict]:
+    """
+    Annotate each spec with the normalized fields the matchers read, computed
+    once per load instead of on every query:
+      _model_name_lc, _model_id_lc - lowercased name/id
+      _name_tokens                 - lowercased name split on '-'
+      _device_type_uc              - uppercased device type
+      _size                        - _DEVICE_SIZES entry for the device (0 if unknown)
+      _status_uc                   - uppercased status
+      _metal_sha7, _vllm_sha7      - 7-char commit prefixes ('' if unset)
+      _arch_name                   - env_vars ARCH_NAME ('' if unset)
+      _param_count                 - param_count, 999 when unknown
+      _task_keywords               - TASK_KEYWORDS entries found in name/id
+    """
+    for spec in specs:
+        name_lc = spec.get('model_name', '').lower()
+        id_lc = spec.get('model_id', '').lower()
+        spec['_model_name_lc'] = name_lc
+        spec['_model_id_lc'] = id_lc
+        spec['_name_tokens'] = tuple(name_lc.split('-'))
+        spec['_device_type_uc'] = device_type_uc = spec.get('device_type', '').upper()
+        spec['_size'] = _DEVICE_SIZES.get(device_type_uc, 0)
+        spec['_status_uc'] = spec.get('status', 'UNKNOWN').upper()
+        spec['_metal_sha7'] = _sha7(spec.get('tt_metal_commit'))
+        spec['_vllm_sha7'] = _sha7(spec.get('vllm_commit'))
+        spec['_arch_name'] = spec.get('env_vars', {}).get('ARCH_NAME', '')
+        # Billion parameters; unknown size is assumed large
+        param_count = spec.get('param_count')
+        spec['_param_count'] = 999 if param_count is None else param_count
+        spec['_task_keywords'] = frozenset(
+            kw for kw in _TASK_KEYWORD_VOCAB if kw in name_lc or kw in id_lc
+        )
+    return specs
+
+
+def _spec_status(spec: Dict) -> str:
+    """Uppercased status, for specs that may not have been through _prepare_specs()."""
+    return spec.get('_status_uc') or spec.get('status', 'UNKNOWN').upper()
+
+
 def fetch_model_specs(force_refresh: bool = False) -> Optional[List[Dict]]:
     """
     Fetch model specifications from tt-inference-server GitHub.
     Uses cached version if less than 1 hour old (unless force_refresh=True).
     Returns list of model specs or None if fetch fails.
     """
-    import time
+    import shutil
 
     # Cache location
     cache_dir = Path.home() / 'tt-scratchpad' / 'cache'
@@ -478,8 +715,7 @@ def fetch_model_specs(force_refresh: bool = False) -> Optional[List[Dict]]:
     # Use cache if valid
     if cache_valid:
         try:
-            with open(cache_file, 'r') as f:
-                data = json.load(f)
+            data = _load_json_file(cache_file)
 
             # Handle both dict (current format) and list formats
             if isinstance(data, dict):
@@ -492,7 +728,7 @@ def fetch_model_specs(force_refresh: bool = False) -> Optional[List[Dict]]:
 
             if cache_valid:
                 print_success(f"Loaded {len(specs)} model specifications from cache")
-                return specs
+                return _prepare_specs(specs)
         except Exception as e:
             print_warning(f"Failed to read cache: {e}")
             cache_valid = False
@@ -501,9 +737,12 @@ def fetch_model_specs(force_refresh: bool = False) -> Optional[List[Dict]]:
     url = "https://raw.githubusercontent.com/tenstorrent/tt-inference-server/main/model_specs_output.json"
     print_info("Fetching model specifications from tt-inference-server...")
 
+    # Stream the payload to disk; it only replaces the cache once it parses
+    tmp_file = cache_file.with_suffix('.json.tmp')
     try:
-        with urlopen(url, timeout=10) as response:
-            data = json.loads(response.read().decode('utf-8'))
+        with urlopen(url, timeout=10) as response, open(tmp_file, 'wb') as out:
+            shutil.copyfileobj(response, out, 65536)
+        data = _load_json_file(tmp_file)
 
         # Handle both dict (current format) and list formats
         if isinstance(data, dict):
@@ -516,133 +755,176 @@ def fetch_model_specs(force_refresh: bool = False) -> Optional[List[Dict]]:
 
         print_success(f"Fetched {len(specs)} model specifications")
 
-        # Save to cache
+        # Save to cache (the fetched bytes as-is; no re-serialization)
         try:
-            with open(cache_file, 'w') as f:
-                json.dump(data, f)
+            os.replace(tmp_file, cache_file)
             with open(cache_timestamp_file, 'w') as f:
                 f.write(str(time.time()))
             print_info(f"Cached to {cache_file}")
         except Exception as e:
             print_warning(f"Failed to cache specs: {e}")
 
-        return specs
+        return _prepare_specs(specs)
 
     except Exception as e:
         print_error(f"Failed to fetch model specs: {e}")
         print_warning("Will operate with limited information")
         return None
+    finally:
+        # Only left behind when the download, parse or cache rename failed
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
 
 
 # ============================================================================
 # Model Matching
 # ============================================================================
 
+# Task -> keywords matched against model name/id by match_task()
+TASK_KEYWORDS = {
+    'chat': ('llama', 'mistral', 'qwen', 'gemma'),
+    'code': ('llama', 'qwen', 'code'),
+    'code_assistant': ('llama', 'qwen', 'code'),
+    'generate_image': ('stable', 'diffusion', 'sd', 'image'),
+    'image': ('stable', 'diffusion', 'sd', 'image'),  # Alias
+    'generate_video': ('video', 'sora'),
+    'video': ('video', 'sora'),  # Alias
+    'agent': ('qwen', 'llama', 'agent'),
+    'reasoning': ('qwq', 'reason'),
+}
+
+# Every keyword above; _prepare_specs() records which ones each spec contains
+_TASK_KEYWORD_VOCAB = frozenset(kw for kws in TASK_KEYWORDS.values() for kw in kws)
+
+# Architecture mappings
+ARCH_FAMILIES = {
+    'wormhole_b0': ('N150', 'N300', 'T3K', 'N150X4'),
+    'blackhole': ('P100', 'P150', 'P150X4', 'P150X8'),
+}
+_ARCH_BY_DEVICE = {d: arch for arch, devices in ARCH_FAMILIES.items() for d in devices}
+
+# Relative device "size" for the smaller-model-on-larger-device heuristic
+_DEVICE_SIZES = {
+    'N150': 150, 'N300': 300, 'T3K': 3000, 'N150X4': 600,
+    'P100': 100, 'P150': 150, 'P150X4': 600, 'P150X8': 1200
+}
+
+# Experimental compatibility reasons, bit i of a spec's _compat_mask -> entry i
+_REASON_STRINGS = (
+    "same architecture ({arch})",
+    "smaller model on larger device",
+    "officially marked experimental",
+)
+
+
+def _compatibility_reason(spec: Dict) -> str:
+    """Render a spec's _compat_mask as text ('' when it has none)."""
+    mask = spec.get('_compat_mask', 0)
+    return ', '.join(reason.format(arch=spec['_arch_name'])
+                     for i, reason in enumerate(_REASON_STRINGS) if mask & (1 << i))
+
+
+class HardwareIndex:
+    """
+    Positions of a specs list bucketed the way filter_by_hardware queries them.
+
+    by_device    - uppercased device_type -> positions
+    by_arch      - env_vars ARCH_NAME -> positions
+    experimental - positions of specs with status EXPERIMENTAL
+    Specs without a device_type are left out, matching filter_by_hardware.
+    """
+
+    def __init__(self, specs: List[Dict]):
+        self.by_device: Dict[str, List[int]] = {}
+        self.by_arch: Dict[str, List[int]] = {}
+        self.experimental: List[int] = []
+        for pos, spec in enumerate(specs):
+            if 'device_type' not in spec:
+                continue
+            self.by_device.setdefault(spec['_device_type_uc'], []).append(pos)
+            if spec['_arch_name']:
+                self.by_arch.setdefault(spec['_arch_name'], []).append(pos)
+            if spec['_status_uc'] == 'EXPERIMENTAL':
+                self.experimental.append(pos)
+
+
+# Index for the most recently filtered specs list: (specs, len(specs), index)
+_HW_INDEX_CACHE: Optional[Tuple[List[Dict], int, HardwareIndex]] = None
+
+
+def _hardware_index(specs: List[Dict]) -> HardwareIndex:
+    """Return a HardwareIndex for specs, reusing it while the same list is filtered again."""
+    global _HW_INDEX_CACHE
+    if _HW_INDEX_CACHE is None or _HW_INDEX_CACHE[0] is not specs or _HW_INDEX_CACHE[1] != len(specs):
+        _HW_INDEX_CACHE = (specs, len(specs), HardwareIndex(specs))
+    return _HW_INDEX_CACHE[2]
+
+
 def filter_by_hardware(specs: List[Dict], hardware: str, include_experimental: bool = False) -> Tuple[List[Dict], List[Dict]]:
     """
     Filter specs by hardware compatibility.
 
+    The experimental buckets are only consulted when include_experimental is
+    set; otherwise experimental_specs is returned as [] straight away.
+
     Returns:
         (validated_specs, experimental_specs) - Validated models and experimental maybes
     """
-    validated = []
-    experimental = []
-    hardware_upper = hardware.upper()
-
-    # Architecture mappings
-    arch_families = {
-        'wormhole_b0': ['N150', 'N300', 'T3K', 'N150X4'],
-        'blackhole': ['P100', 'P150', 'P150X4', 'P150X8'],
-    }
+    return search_specs(specs, hardware, include_experimental=include_experimental)
 
-    # Find user's architecture family
-    user_arch_family = None
-    for arch, devices in arch_families.items():
-        if any(d in hardware_upper for d in devices):
-            user_arch_family = arch
-            break
 
-    for spec in specs:
-        if 'device_type' not in spec:
-            continue
+class ModelTrie:
+    """
+    Prefix trie over each spec's lowercased model name, model id and name tokens.
 
-        device_type = spec['device_type'].upper()
-        status = spec.get('status', 'UNKNOWN').upper()
-        spec_arch = spec.get('env_vars', {}).get('ARCH_NAME', '')
-        param_count = spec.get('param_count')  # Billion parameters
-        if param_count is None:
-            param_count = 999  # Unknown size, assume large
-
-        # Exact device match
-        if hardware_upper in device_type or device_type in hardware_upper:
-            # Exact device match goes to validated list regardless of status
-            # (status badge will show EXPERIMENTAL warning if needed)
-            validated.append(spec)
-
-        elif include_experimental:
-            # Check for partial compatibility
-            is_compatible = False
-            compatibility_reason = []
-
-            # Same architecture family (e.g., all Wormhole devices)
-            if spec_arch and user_arch_family and spec_arch == user_arch_family:
-                is_compatible = True
-                compatibility_reason.append(f"same architecture ({spec_arch})")
+    Nodes are dicts keyed by character; the '' key of a node holds the positions
+    (in the indexed specs list) of every string passing through it, so a prefix
+    lookup is a single walk of len(prefix) steps with no per-spec scan.
+    """
 
-            # Smaller model on potentially larger device
-            # (crude heuristic: if your device is "larger" in name/number)
-            device_numbers = {
-                'N150': 150, 'N300': 300, 'T3K': 3000, 'N150X4': 600,
-                'P100': 100, 'P150': 150, 'P150X4': 600, 'P150X8': 1200
-            }
-            user_size = device_numbers.get(hardware_upper, 0)
-            spec_size = device_numbers.get(device_type, 0)
+    def __init__(self, specs: List[Dict]):
+        self.root: Dict = {}
+        for pos, spec in enumerate(specs):
+            for key in {spec['_model_name_lc'], spec['_model_id_lc'], *spec['_name_tokens']}:
+                node = self.root
+                for ch in key:
+                    node = node.setdefault(ch, {})
+                    node.setdefault('', set()).add(pos)
 
-            if user_size > spec_size and param_count <= 8:
-                is_compatible = True
-                compatibility_reason.append(f"smaller model on larger device")
+    def lookup(self, prefix: str) -> set:
+        """Return positions of specs with a name, id or name token starting with prefix."""
+        node = self.root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return set()
+        return node.get('', set())
 
-            # Status is EXPERIMENTAL (official experimental support)
-            if status == 'EXPERIMENTAL':
-                is_compatible = True
-                compatibility_reason.append("officially marked experimental")
 
-            if is_compatible:
-                # Annotate spec with compatibility reason
-                spec['_compatibility_reason'] = ', '.join(compatibility_reason)
-                experimental.append(spec)
+# Trie for the most recently matched specs list: (specs, len(specs), trie)
+_TRIE_CACHE: Optional[Tuple[List[Dict], int, ModelTrie]] = None
 
-    return validated, experimental
+
+def _model_trie(specs: List[Dict]) -> ModelTrie:
+    """Return a ModelTrie for specs, reusing it while the same list is queried again."""
+    global _TRIE_CACHE
+    if _TRIE_CACHE is None or _TRIE_CACHE[0] is not specs or _TRIE_CACHE[1] != len(specs):
+        _TRIE_CACHE = (specs, len(specs), ModelTrie(specs))
+    return _TRIE_CACHE[2]
 
 
 def match_model_name(specs: List[Dict], model_query: str) -> List[Dict]:
     """
     Match model specs by name/query.
     Supports fuzzy matching (e.g., 'llama' matches 'Llama-3.1-8B').
-    """
-    model_query_lower = model_query.lower()
-    matches = []
-
-    for spec in specs:
-        model_name = spec.get('model_name', '').lower()
-        model_id = spec.get('model_id', '').lower()
-
-        # Exact match
-        if model_query_lower == model_name:
-            spec['match_score'] = 100
-            matches.append(spec)
-        # Substring match
-        elif model_query_lower in model_name or model_query_lower in model_id:
-            spec['match_score'] = 80
-            matches.append(spec)
-        # Partial word match (e.g., 'llama' in 'Llama-3.1')
-        elif any(word.startswith(model_query_lower) for word in model_name.split('-')):
-            spec['match_score'] = 60
-            matches.append(spec)
-
-    # Sort by match score (highest first)
-    matches.sort(key=lambda x: x.get('match_score', 0), reverse=True)
 
+    Names, ids and name words starting with the query are found via ModelTrie
+    and skip the substring test the other specs get; rapidfuzz (if installed)
+    catches typos when nothing contains the query.
+    """
+    matches, _ = search_specs(specs, model_query=model_query)
     return matches
 
 
@@ -651,36 +933,235 @@ def match_task(specs: List[Dict], task: str) -> List[Dict]:
     Match model specs by task type.
     Tasks: chat, generate_image, generate_video, code_assistant, agent
     """
-    task_lower = task.lower()
-
-    # Task to model type mapping
-    task_mappings = {
-        'chat': ['llama', 'mistral', 'qwen', 'gemma'],
-        'code': ['llama', 'qwen', 'code'],
-        'code_assistant': ['llama', 'qwen', 'code'],
-        'generate_image': ['stable', 'diffusion', 'sd', 'image'],
-        'image': ['stable', 'diffusion', 'sd', 'image'],  # Alias
-        'generate_video': ['video', 'sora'],
-        'video': ['video', 'sora'],  # Alias
-        'agent': ['qwen', 'llama', 'agent'],
-        'reasoning': ['qwq', 'reason'],
-    }
+    matches, _ = search_specs(specs, task=task)
+    return matches
 
-    # Get relevant keywords for this task
-    keywords = task_mappings.get(task_lower, [task_lower])
 
-    matches = []
-    for spec in specs:
-        model_name = spec.get('model_name', '').lower()
-        model_id = spec.get('model_id', '').lower()
+# Catalogs at least this large use numpy for substring scans (when installed);
+# below it the import and array build cost more than the per-spec loop
+_NUMPY_MIN_SPECS = 2048
 
-        for keyword in keywords:
-            if keyword in model_name or keyword in model_id:
-                spec['match_score'] = 70
-                matches.append(spec)
-                break
+# Name/id arrays for the most recently scanned specs list: (specs, len(specs), names, ids)
+_CHAR_ARRAY_CACHE = None
+
+
+@functools.lru_cache(maxsize=1)
+def _numpy():
+    """Import numpy on first use; None when it isn't installed."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _substring_hits(specs: List[Dict], needle: str) -> Optional[set]:
+    """
+    Positions of specs whose lowercased name or id contains needle, found with
+    numpy's vectorized string search. Returns None for small catalogs or when
+    numpy is missing; callers then check each spec in Python.
+    """
+    if len(specs) < _NUMPY_MIN_SPECS:
+        return None
+    np = _numpy()
+    if np is None:
+        return None
+
+    global _CHAR_ARRAY_CACHE
+    if _CHAR_ARRAY_CACHE is None or _CHAR_ARRAY_CACHE[0] is not specs or _CHAR_ARRAY_CACHE[1] != len(specs):
+        names = np.array([spec['_model_name_lc'] for spec in specs], dtype=str)
+        ids = np.array([spec['_model_id_lc'] for spec in specs], dtype=str)
+        _CHAR_ARRAY_CACHE = (specs, len(specs), names, ids)
+    _, _, names, ids = _CHAR_ARRAY_CACHE
+
+    mask = (np.char.find(names, needle) >= 0) | (np.char.find(ids, needle) >= 0)
+    return set(np.flatnonzero(mask).tolist())
+
+
+@functools.lru_cache(maxsize=1)
+def _rapidfuzz():
+    """Import rapidfuzz's (fuzz, process) on first use; None when it isn't installed."""
+    try:
+        from rapidfuzz import fuzz, process
+    except ImportError:
+        return None
+    return fuzz, process
+
+
+def _fuzzy_hits(specs: List[Dict], query: str) -> Optional[set]:
+    """
+    Positions of specs whose lowercased name approximately contains query
+    (rapidfuzz partial_ratio >= 80). Returns None when rapidfuzz is missing.
+    """
+    rapidfuzz = _rapidfuzz()
+    if rapidfuzz is None:
+        return None
+    fuzz, process = rapidfuzz
+    matches = process.extract(query, [spec['_model_name_lc'] for spec in specs],
+                              scorer=fuzz.partial_ratio, score_cutoff=80, limit=None)
+    return {pos for _, _, pos in matches}
+
+
+def search_specs(specs: List[Dict], hardware: Optional[str] = None, model_query: Optional[str] = None,
+                 task: Optional[str] = None, include_experimental: bool = False) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Filter specs by hardware, model name and task in a single pass.
+
+    Hardware candidates come from the HardwareIndex buckets and name prefixes
+    from the ModelTrie, so each candidate spec is visited once and no
+    intermediate lists are built. A None argument skips that filter
+    (hardware=None treats every spec as validated). Name matches are sorted
+    by match score, as match_model_name does.
+
+    Returns:
+        (validated_specs, experimental_specs)
+    """
+    # Specs built outside fetch_model_specs() (TUI, tests, other callers)
+    # get the normalized fields the buckets and trie read
+    unprepared = [spec for spec in specs if '_task_keywords' not in spec]
+    if unprepared:
+        _prepare_specs(unprepared)
+
+    # === Hardware: candidate positions from the device/arch buckets ===
+    experimental_reasons: Dict[int, int] = {}  # position -> _REASON_STRINGS bitmask
+    if hardware is None:
+        validated_pos = range(len(specs))
+    else:
+        hardware_upper = hardware.upper()
+
+        # Find user's architecture family; fall back to a substring probe for
+        # board names that only contain a known device (e.g. 'N300 L')
+        user_arch_family = _ARCH_BY_DEVICE.get(hardware_upper)
+        if user_arch_family is None:
+            for arch, devices in ARCH_FAMILIES.items():
+                if any(d in hardware_upper for d in devices):
+                    user_arch_family = arch
+                    break
+
+        index = _hardware_index(specs)
+
+        # Every device type the user's hardware matches (either name contains the other).
+        # Exact device match goes to validated list regardless of status
+        # (status badge will show EXPERIMENTAL warning if needed)
+        matched_devices = [d for d in index.by_device if hardware_upper in d or d in hardware_upper]
+        validated_pos = sorted(pos for d in matched_devices for pos in index.by_device[d])
+
+        if include_experimental:
+            # Smaller model on potentially larger device
+            # (crude heuristic: if your device is "larger" in name/number)
+            user_size = _DEVICE_SIZES.get(hardware_upper, 0)
+            smaller_devices = [d for d in index.by_device if user_size > _DEVICE_SIZES.get(d, 0)]
+
+            # Candidates come from the buckets instead of a scan of every spec
+            candidates = set(index.experimental)
+            if user_arch_family:
+                candidates.update(index.by_arch.get(user_arch_family, ()))
+            for d in smaller_devices:
+                candidates.update(index.by_device[d])
+            candidates.difference_update(validated_pos)
+
+            for pos in sorted(candidates):
+                spec = specs[pos]
+                spec_arch = spec['_arch_name']
+                reason_mask = 0
+
+                # Same architecture family (e.g., all Wormhole devices)
+                if spec_arch and user_arch_family and spec_arch == user_arch_family:
+                    reason_mask |= 1
+
+                if user_size > spec['_size'] and spec['_param_count'] <= 8:
+                    reason_mask |= 2
+
+                # Status is EXPERIMENTAL (official experimental support)
+                if spec['_status_uc'] == 'EXPERIMENTAL':
+                    reason_mask |= 4
+
+                if reason_mask:
+                    experimental_reasons[pos] = reason_mask
+
+    # === Model name: substring of name or id; trie prefix hits skip the test ===
+    query = model_query.lower() if model_query is not None else None
+    prefix_hits = _model_trie(specs).lookup(query) if query else set()
+
+    # Large catalogs answer the substring test with one vectorized scan
+    name_hits = _substring_hits(specs, query) if query else None
+
+    # === Task: known tasks use the keyword hits found by _prepare_specs() ===
+    task_lower = task.lower() if task is not None else None
+    keywords = TASK_KEYWORDS.get(task_lower) if task is not None else None
+    task_hits = _substring_hits(specs, task_lower) if task_lower and keywords is None else None
+
+    def select(positions) -> List[Dict]:
+        selected = []
+        for pos in positions:
+            spec = specs[pos]
+
+            if query is not None:
+                # Typo-tolerant second pass (see below)
+                if fuzzy_hits is not None:
+                    if pos not in fuzzy_hits:
+                        continue
+                    spec['match_score'] = 60
+                # A name, id or word starting with the query also contains it,
+                # so only the other candidates need the substring test
+                elif pos not in prefix_hits:
+                    if name_hits is not None:
+                        if pos not in name_hits:
+                            continue
+                    elif query not in spec['_model_name_lc'] and query not in spec['_model_id_lc']:
+                        continue
+                if fuzzy_hits is None:
+                    # Exact match scores above a prefix/substring match
+                    spec['match_score'] = 100 if query == spec['_model_name_lc'] else 80
+
+            if task_lower is not None:
+                if keywords is not None:
+                    matched = not spec['_task_keywords'].isdisjoint(keywords)
+                elif task_hits is not None:
+                    matched = pos in task_hits
+                else:
+                    # Free-form task: use it as the keyword
+                    matched = task_lower in spec['_model_name_lc'] or task_lower in spec['_model_id_lc']
+                if not matched:
+                    continue
+                if query is None:
+                    spec['match_score'] = 70
+
+            if pos in experimental_reasons:
+                # Annotate spec with compatibility reasons (rendered by _compatibility_reason)
+                spec['_compat_mask'] = experimental_reasons[pos]
+            selected.append(spec)
+        return selected
+
+    fuzzy_hits = None
+    validated = select(validated_pos)
+    experimental = select(sorted(experimental_reasons)) if experimental_reasons else []
+
+    # Nothing contains the query: retry with approximate matches (e.g. 'lama3')
+    if query and not validated and not experimental:
+        fuzzy_hits = _fuzzy_hits(specs, query)
+        if fuzzy_hits:
+            validated = select(validated_pos)
+            experimental = select(sorted(experimental_reasons)) if experimental_reasons else []
+
+    if query is not None:
+        # Sort by match score (highest first)
+        validated.sort(key=lambda x: x.get('match_score', 0), reverse=True)
+        experimental.sort(key=lambda x: x.get('match_score', 0), reverse=True)
+
+    return validated, experimental
+
+
+# Spec commit values that never match a checkout: unset, or a branch name
+# ('main', 'dev') that must always be fetched and checked out
+_SENTINEL_COMMITS = frozenset({'None', 'null', None, '', 'main', 'dev'})
 
-    return matches
+
+def _commits_match(current: str, required: str) -> bool:
+    """Compare normalized 7-char git commit prefixes (see _sha7)."""
+    if not current or required in _SENTINEL_COMMITS:
+        return False
+    return current == required
 
 
 def check_environment_match(spec: Dict, metal_info: Optional[Dict], vllm_info: Optional[Dict]) -> Dict[str, any]:
@@ -688,14 +1169,6 @@ def check_environment_match(spec: Dict, metal_info: Optional[Dict], vllm_info: O
     Check if current environment matches spec requirements.
     Returns dict with compatibility info.
     """
-    # Helper to compare commits (handles different SHA lengths)
-    def commits_match(current: str, required: str) -> bool:
-        if not current or not required or required in ['None', 'null']:
-            return False
-        # Normalize to first 7 chars for comparison
-        min_len = min(len(current), len(required), 7)
-        return current[:min_len] == required[:min_len]
-
     match_info = {
         'metal_compatible': False,
         'vllm_compatible': False,
@@ -712,7 +1185,8 @@ def check_environment_match(spec: Dict, metal_info: Optional[Dict], vllm_info: O
     current_metal_commit = metal_info.get('commit', '')
 
     if spec_metal_commit and current_metal_commit:
-        if commits_match(current_metal_commit, spec_metal_commit):
+        if _commits_match(metal_info.get('sha7') or _sha7(current_metal_commit),
+                          spec.get('_metal_sha7') or _sha7(spec_metal_commit)):
             match_info['metal_compatible'] = True
         else:
             match_info['metal_diff'] = f"{current_metal_commit} -> {spec_metal_commit}"
@@ -722,7 +1196,8 @@ def check_environment_match(spec: Dict, metal_info: Optional[Dict], vllm_info: O
     current_vllm_commit = vllm_info.get('commit', '')
 
     if spec_vllm_commit and current_vllm_commit:
-        if commits_match(current_vllm_commit, spec_vllm_commit):
+        if _commits_match(vllm_info.get('sha7') or _sha7(current_vllm_commit),
+                          spec.get('_vllm_sha7') or _sha7(spec_vllm_commit)):
             match_info['vllm_compatible'] = True
         else:
             match_info['vllm_diff'] = f"{current_vllm_commit} -> {spec_vllm_commit}"
@@ -743,80 +1218,96 @@ def apply_conservative_params(spec: Dict) -> Dict:
     Apply conservative parameters for experimental/unvalidated models.
     Reduces memory-intensive parameters by 33% to minimize OOM risk.
     """
-    conservative_spec = spec.copy()
-    device_model_spec = conservative_spec.get('device_model_spec', {}).copy()
+    device_model_spec = spec.get('device_model_spec', {})
+    changed = {}
 
     # Reduce context length by 33%
     if 'max_context' in device_model_spec:
-        original = device_model_spec['max_context']
-        device_model_spec['max_context'] = int(original * 0.67)
+        changed['max_context'] = int(device_model_spec['max_context'] * 0.67)
 
     # Reduce batch size by 33%
     if 'max_num_seqs' in device_model_spec:
-        original = device_model_spec['max_num_seqs']
-        device_model_spec['max_num_seqs'] = max(1, int(original * 0.67))
+        changed['max_num_seqs'] = max(1, int(device_model_spec['max_num_seqs'] * 0.67))
 
-    conservative_spec['device_model_spec'] = device_model_spec
-    conservative_spec['_is_experimental'] = True  # Mark as experimental
+    # Nothing to reduce: share device_model_spec, only mark as experimental
+    if not changed:
+        return {**spec, '_is_experimental': True}
 
-    return conservative_spec
+    return {**spec, 'device_model_spec': {**device_model_spec, **changed}, '_is_experimental': True}
 
 
 # ============================================================================
 # Display Functions
 # ============================================================================
 
+def _max_context(spec: Dict):
+    """Return max_context from the spec's nested device_model_spec, or 'N/A'."""
+    return (spec.get('device_model_spec') or {}).get('max_context', 'N/A')
+
+
 def display_model_spec(spec: Dict, index: int, env_match: Optional[Dict] = None, is_experimental: bool = False):
     """Display a single model spec in a readable format."""
-    print(f"\n{Colors.BOLD}[{index}] {spec.get('model_name', 'Unknown Model')}{Colors.ENDC}")
+    sys.stdout.write(_format_model_spec(spec, index, env_match, is_experimental))
+
+
+def _format_model_spec(spec: Dict, index: int, env_match: Optional[Dict] = None,
+                       is_experimental: bool = False) -> str:
+    """Return display_model_spec's text for a spec (newline-terminated)."""
+    # Collect the lines and join them once rather than one print() per line
+    lines = [f"\n{Colors.BOLD}[{index}] {spec.get('model_name', 'Unknown Model')}{Colors.ENDC}"]
+    add = lines.append
 
     if is_experimental:
-        print(f"    {Colors.WARNING}⚠ EXPERIMENTAL - Not validated for this hardware{Colors.ENDC}")
-        compatibility_reason = spec.get('_compatibility_reason', 'might be compatible')
-        print(f"    {Colors.WARNING}Reason: {compatibility_reason}{Colors.ENDC}")
-        print(f"    {Colors.WARNING}Using conservative parameters (33% reduction){Colors.ENDC}")
+        add(f"    {Colors.WARNING}⚠ EXPERIMENTAL - Not validated for this hardware{Colors.ENDC}")
+        compatibility_reason = _compatibility_reason(spec) or 'might be compatible'
+        add(f"    {Colors.WARNING}Reason: {compatibility_reason}{Colors.ENDC}")
+        add(f"    {Colors.WARNING}Using conservative parameters (33% reduction){Colors.ENDC}")
 
     status = spec.get('status', 'UNKNOWN').upper()
     if status == 'EXPERIMENTAL':
-        print(f"    {Colors.WARNING}Status: EXPERIMENTAL{Colors.ENDC}")
+        add(f"    {Colors.WARNING}Status: EXPERIMENTAL{Colors.ENDC}")
     elif status in ['COMPLETE', 'FUNCTIONAL']:
-        print(f"    {Colors.OKGREEN}Status: {status}{Colors.ENDC}")
+        add(f"    {Colors.OKGREEN}Status: {status}{Colors.ENDC}")
 
-    print(f"    ID: {spec.get('model_id', 'N/A')}")
-    print(f"    HuggingFace: {spec.get('hf_model_repo', 'N/A')}")
-    print(f"    Device: {spec.get('device_type', 'N/A')}")
-    print(f"    Version: {spec.get('version', 'N/A')}")
-    print(f"    tt-metal commit: {spec.get('tt_metal_commit', 'N/A')}")
-    print(f"    vLLM commit: {spec.get('vllm_commit', 'N/A')}")
+    add(f"    ID: {spec.get('model_id', 'N/A')}")
+    add(f"    HuggingFace: {spec.get('hf_model_repo', 'N/A')}")
+    add(f"    Device: {spec.get('device_type', 'N/A')}")
+    add(f"    Version: {spec.get('version', 'N/A')}")
+    add(f"    tt-metal commit: {spec.get('tt_metal_commit', 'N/A')}")
+    add(f"    vLLM commit: {spec.get('vllm_commit', 'N/A')}")
 
     # Max context is nested in device_model_spec
-    if 'device_model_spec' in spec and 'max_context' in spec['device_model_spec']:
-        print(f"    Max context: {spec['device_model_spec']['max_context']:,} tokens")
+    max_context = _max_context(spec)
+    if max_context != 'N/A':
+        add(f"    Max context: {max_context:,} tokens")
     if 'min_disk_gb' in spec:
-        print(f"    Min disk: {spec['min_disk_gb']} GB")
+        add(f"    Min disk: {spec['min_disk_gb']} GB")
     if 'min_ram_gb' in spec:
-        print(f"    Min RAM: {spec['min_ram_gb']} GB")
+        add(f"    Min RAM: {spec['min_ram_gb']} GB")
 
     # Check model download status
     model_info = detect_model_download(spec)
     if model_info:
         if model_info['exists']:
-            print(f"    {Colors.OKGREEN}Model: Downloaded ✓{Colors.ENDC}")
-            print(f"      Path: {model_info['path']}")
+            add(f"    {Colors.OKGREEN}Model: Downloaded ✓{Colors.ENDC}")
+            add(f"      Path: {model_info['path']}")
         else:
-            print(f"    {Colors.WARNING}Model: Not downloaded{Colors.ENDC}")
-            print(f"      Will download to: {model_info['path']}")
+            add(f"    {Colors.WARNING}Model: Not downloaded{Colors.ENDC}")
+            add(f"      Will download to: {model_info['path']}")
 
     # Show environment compatibility
     if env_match:
         if env_match['needs_setup']:
-            print(f"    {Colors.WARNING}Environment: Setup required{Colors.ENDC}")
+            add(f"    {Colors.WARNING}Environment: Setup required{Colors.ENDC}")
             if env_match['metal_diff']:
-                print(f"      tt-metal: {env_match['metal_diff']}")
+                add(f"      tt-metal: {env_match['metal_diff']}")
             if env_match['vllm_diff']:
-                print(f"      vLLM: {env_match['vllm_diff']}")
+                add(f"      vLLM: {env_match['vllm_diff']}")
         else:
-            print(f"    {Colors.OKGREEN}Environment: Matches! ✓{Colors.ENDC}")
+            add(f"    {Colors.OKGREEN}Environment: Matches! ✓{Colors.ENDC}")
+
+    lines.append('')
+    return '\n'.join(lines)
 
 
 def display_current_environment(hardware: Optional[str], firmware: Optional[str],
@@ -825,50 +1316,60 @@ def display_current_environment(hardware: Optional[str], firmware: Optional[str]
     """Display current system environment."""
     print_header("Current Environment")
 
+    # Collect the lines and write them in one go
+    parts = []
+
     # Hardware
     if hardware:
-        print_success(f"Hardware: {hardware}")
+        print_success(f"Hardware: {hardware}", parts)
     else:
-        print_error("Hardware: Not detected")
+        print_error("Hardware: Not detected", parts)
 
     # Firmware
     if firmware:
-        print_info(f"Firmware: {firmware}")
+        print_info(f"Firmware: {firmware}", parts)
     else:
-        print_warning("Firmware: Unknown")
+        print_warning("Firmware: Unknown", parts)
 
     # Python
     if python_ok:
-        print_success(f"Python: {python_ver}")
+        print_success(f"Python: {python_ver}", parts)
     else:
-        print_error(f"Python: {python_ver} (requires 3.9+)")
+        print_error(f"Python: {python_ver} (requires 3.9+)", parts)
 
     # tt-metal
     if metal:
-        print_success(f"tt-metal: {metal['path']}")
-        print_info(f"  Branch: {metal['branch']}, Commit: {metal['commit']}")
+        print_success(f"tt-metal: {metal['path']}", parts)
+        print_info(f"  Branch: {metal['branch']}, Commit: {metal['commit']}", parts)
     else:
-        print_error("tt-metal: Not found")
+        print_error("tt-metal: Not found", parts)
 
     # tt-vllm
     if vllm:
-        print_success(f"tt-vllm: {vllm['path']}")
-        print_info(f"  Branch: {vllm['branch']}, Commit: {vllm['commit']}")
+        print_success(f"tt-vllm: {vllm['path']}", parts)
+        print_info(f"  Branch: {vllm['branch']}, Commit: {vllm['commit']}", parts)
     else:
-        print_error("tt-vllm: Not found")
+        print_error("tt-vllm: Not found", parts)
+
+    sys.stdout.write(''.join(parts))
 
 
 # ============================================================================
 # Model Download Detection
 # ============================================================================
 
+# Files whose presence marks a directory as a downloaded model
+_MODEL_MARKER_FILES = frozenset({'config.json', 'model.safetensors', 'pytorch_model.bin'})
+
+# detect_model_download results keyed by (hf_repo, model_name); cleared by refresh_hardware()
+_MODEL_PATH_CACHE: Dict[Tuple[str, str], Optional[Dict[str, str]]] = {}
+
+
 def detect_model_download(spec: Dict) -> Optional[Dict[str, str]]:
     """
     Check if model is already downloaded from HuggingFace.
     Returns dict with path info or None if not found.
     """
-    import os
-
     # Get HuggingFace model repo from spec
     hf_repo = spec.get('hf_model_repo', '')
     model_name = spec.get('model_name', '')
@@ -876,32 +1377,43 @@ def detect_model_download(spec: Dict) -> Optional[Dict[str, str]]:
     if not hf_repo:
         return None
 
+    key = (hf_repo, model_name)
+    if key in _MODEL_PATH_CACHE:
+        return _MODEL_PATH_CACHE[key]
+
     # Common model download locations
     possible_paths = [
         Path.home() / 'models' / model_name,
         Path.home() / '.cache' / 'huggingface' / 'hub' / f"models--{hf_repo.replace('/', '--')}",
     ]
 
-    for path in possible_paths:
-        if path.exists():
-            # Check if it looks like a valid model directory
-            # (has config.json or pytorch files)
-            if any((path / f).exists() for f in ['config.json', 'model.safetensors', 'pytorch_model.bin']):
-                return {
-                    'path': str(path),
-                    'exists': True,
-                }
-
-    return {
-        'path': str(Path.home() / 'models' / model_name),
+    result = {
+        'path': str(possible_paths[0]),
         'exists': False,
     }
+    for path in possible_paths:
+        # One directory listing per candidate instead of a stat per marker file
+        try:
+            with os.scandir(path) as entries:
+                names = {entry.name for entry in entries}
+        except OSError:
+            continue
+        # Check if it looks like a valid model directory
+        # (has config.json or pytorch files)
+        if not _MODEL_MARKER_FILES.isdisjoint(names):
+            result = {
+                'path': str(path),
+                'exists': True,
+            }
+            break
 
+    _MODEL_PATH_CACHE[key] = result
+    return result
 
-def check_hf_token() -> Optional[str]:
-    """Check if HuggingFace token is available."""
-    import os
 
+@functools.lru_cache(maxsize=1)
+def check_hf_token() -> Optional[str]:
+    """Check if HuggingFace token is available (read once per process)."""
     # Check environment variable
     token = os.environ.get('HF_TOKEN')
     if token:
@@ -919,10 +1431,126 @@ def check_hf_token() -> Optional[str]:
     return None
 
 
+@functools.lru_cache(maxsize=1)
+def _hf_logged_in() -> bool:
+    """Check `huggingface-cli whoami` once per process."""
+    returncode, _ = _run(['huggingface-cli', 'whoami'], None, 10)
+    return returncode == 0
+
+
 # ============================================================================
 # Automated Setup Execution (v0.0.74 - Full Automation, Direct Execution)
 # ============================================================================
 
+def _run(args: List[str], cwd: Optional[Path], timeout: int) -> Tuple[int, str]:
+    """Run a setup command with captured output; returns (returncode, stderr)."""
+    result = subprocess.run(args, cwd=cwd, capture_output=True, text=True, timeout=timeout)
+    return result.returncode, result.stderr
+
+
+def _run_streamed(args: List[str], cwd: Optional[Path], timeout: int) -> Tuple[int, str]:
+    """
+    Run a long setup command (model download, build) without buffering its
+    whole output: progress lines ('%') are echoed to stderr as they arrive and
+    only the last lines are kept for error messages. Returns (returncode, tail).
+    """
+    proc = subprocess.Popen(args, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                            text=True, bufsize=1)
+
+    # Reading stdout blocks, so the timeout is enforced by killing the process
+    timed_out = threading.Event()
+
+    def _kill():
+        timed_out.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, _kill)
+    timer.start()
+    tail = collections.deque(maxlen=50)
+    progress = False
+    try:
+        for line in proc.stdout:
+            tail.append(line)
+            if '%' in line:
+                sys.stderr.write('\r' + line.rstrip())
+                sys.stderr.flush()
+                progress = True
+        returncode = proc.wait()
+    finally:
+        timer.cancel()
+        proc.stdout.close()
+        if progress:
+            sys.stderr.write('\n')
+
+    if timed_out.is_set():
+        raise subprocess.TimeoutExpired(args, timeout)
+    return returncode, ''.join(tail)
+
+
+_SHA_RE = re.compile(r'[0-9a-fA-F]{7,40}')
+
+
+def _fetch_unless_present(repo: Path, commit: str) -> Tuple[int, str]:
+    """
+    Run `git fetch origin` in repo unless commit is a SHA already in its object
+    database. Branch names are always fetched so they are not left stale.
+    """
+    if _SHA_RE.fullmatch(commit or ''):
+        returncode, _ = _run(['git', 'cat-file', '-e', f'{commit}^{{commit}}'], repo, 5)
+        if returncode == 0:
+            return 0, ''
+    return _run(['git', 'fetch', 'origin'], repo, 60)
+
+
+def _stale_submodules(repo: Path) -> Optional[List[str]]:
+    """
+    Return the top-level submodule paths of repo that need `git submodule update`,
+    from the local-only `git submodule status --recursive` ('-' uninitialized,
+    '+' wrong commit, 'U' conflicts). Returns None if the status can't be read.
+    """
+    result = subprocess.run(['git', 'submodule', 'status', '--recursive'],
+                            cwd=repo, capture_output=True, text=True, timeout=60)
+    if result.returncode != 0:
+        return None
+
+    paths, dirty = [], []
+    for line in result.stdout.splitlines():
+        fields = line[1:].split()
+        if len(fields) < 2:
+            continue
+        paths.append(fields[1])
+        if line[0] in '-+U':
+            dirty.append(fields[1])
+
+    # Nested submodules are updated through the top-level one containing them
+    stale = []
+    for path in dirty:
+        top = min((p for p in paths if path == p or path.startswith(p + '/')), key=len)
+        if top not in stale:
+            stale.append(top)
+    return stale
+
+
+def _download_model(hf_repo: str, model_path: str) -> Tuple[int, str]:
+    """
+    Download hf_repo into model_path, returning (returncode, error text).
+    Uses huggingface_hub's parallel snapshot_download when the library is
+    installed, otherwise streams `huggingface-cli download` (30 minute timeout).
+    """
+    try:
+        from huggingface_hub import snapshot_download
+    except ImportError:
+        return _run_streamed(['huggingface-cli', 'download', hf_repo, '--local-dir', model_path], None, 1800)
+
+    try:
+        snapshot_download(repo_id=hf_repo, local_dir=model_path, max_workers=8, token=check_hf_token())
+    except Exception as e:
+        # HTTP and connection errors, missing local entries, disk full or
+        # permission denied all fail the download the same way as the CLI
+        return 1, str(e) or type(e).__name__
+    return 0, ''
+
+
 def execute_setup(spec: Dict, model_info: Dict, metal_info: Optional[Dict],
                   vllm_info: Optional[Dict]) -> bool:
     """
@@ -942,160 +1570,122 @@ def execute_setup(spec: Dict, model_info: Dict, metal_info: Optional[Dict],
     metal_commit = spec.get('tt_metal_commit', 'main')
     vllm_commit = spec.get('vllm_commit', 'dev')
 
-    current_metal_commit = metal_info.get('commit', 'unknown') if metal_info else 'unknown'
-    current_vllm_commit = vllm_info.get('commit', 'unknown') if vllm_info else 'unknown'
-
     metal_path = Path(metal_info.get('path', str(Path.home() / 'tt-metal'))) if metal_info else Path.home() / 'tt-metal'
     vllm_path = Path(vllm_info.get('path', str(Path.home() / 'tt-vllm'))) if vllm_info else Path.home() / 'tt-vllm'
 
     print_header(f"Setting up environment for {model_name}")
 
-    # Helper function to compare commits (handles different SHA lengths)
-    def commits_match(current: str, required: str) -> bool:
-        """Compare git commits, handling different SHA lengths."""
-        if current == 'unknown' or required in ['main', 'dev', 'None', None]:
-            return False
-        # Normalize to first 7 chars for comparison
-        min_len = min(len(current), len(required), 7)
-        return current[:min_len] == required[:min_len]
-
-    try:
-        # === TT-METAL CHECKOUT ===
-        if not commits_match(current_metal_commit, metal_commit):
-            print_info("\n📦 Checking out tt-metal...")
-
-            # Stash any uncommitted changes first
-            print_info("Stashing uncommitted changes (if any)...")
-            result = subprocess.run(
-                ['git', 'stash', 'push', '-m', 'Auto-stash by tt-jukebox'],
-                cwd=metal_path,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            # Stash returns 0 even if nothing to stash, so we're good either way
-
-            # Fetch latest
-            result = subprocess.run(
-                ['git', 'fetch', 'origin'],
-                cwd=metal_path,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-            if result.returncode != 0:
-                print_error(f"Failed to fetch tt-metal: {result.stderr}")
-                return False
-
-            # Checkout specific commit
-            result = subprocess.run(
-                ['git', 'checkout', metal_commit],
-                cwd=metal_path,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            if result.returncode != 0:
-                print_error(f"Failed to checkout tt-metal commit {metal_commit}: {result.stderr}")
-                return False
+    # 'sha7' may be missing from detection results cached by older versions
+    current_metal_sha7 = (metal_info.get('sha7') or _sha7(metal_info.get('commit'))) if metal_info else ''
+    current_vllm_sha7 = (vllm_info.get('sha7') or _sha7(vllm_info.get('commit'))) if vllm_info else ''
 
-            # Update submodules
-            print_info("Updating git submodules...")
-            result = subprocess.run(
-                ['git', 'submodule', 'update', '--init', '--recursive'],
-                cwd=metal_path,
-                capture_output=True,
-                text=True,
-                timeout=1500  # 5 minutes for submodules
-            )
-            if result.returncode != 0:
-                print_warning(f"Submodule update had issues (continuing anyway): {result.stderr[:200]}")
+    # Specs that skipped _prepare_specs() have no precomputed prefixes
+    metal_needed = not _commits_match(current_metal_sha7,
+                                      spec.get('_metal_sha7') or _sha7(spec.get('tt_metal_commit')))
+    vllm_needed = not _commits_match(current_vllm_sha7,
+                                     spec.get('_vllm_sha7') or _sha7(spec.get('vllm_commit')))
+    download_needed = not model_exists and bool(hf_repo)
 
-            print_success(f"✓ tt-metal checked out to {metal_commit}")
+    try:
+        # The two fetches are I/O-bound, so they overlap on a small thread pool.
+        # Leaving it waits for a fetch still running (each has _run's timeout),
+        # so no git process outlives this function.
+        pool = ThreadPoolExecutor(max_workers=2)
+        try:
+            # === TT-METAL CHECKOUT ===
+            if metal_needed:
+                print_info("\n📦 Checking out tt-metal...")
+
+                # Stash any uncommitted changes first
+                print_info("Stashing uncommitted changes (if any)...")
+                _run(['git', 'stash', 'push', '-m', 'Auto-stash by tt-jukebox'], metal_path, 30)
+                # Stash returns 0 even if nothing to stash, so we're good either way
+
+            # Fetch both repos concurrently (skipped when the commit is already
+            # local); each checkout waits on its own fetch
+            metal_fetch = pool.submit(_fetch_unless_present, metal_path, metal_commit) if metal_needed else None
+            vllm_fetch = pool.submit(_fetch_unless_present, vllm_path, vllm_commit) if vllm_needed else None
+
+            if metal_needed:
+                returncode, stderr = metal_fetch.result()
+                if returncode != 0:
+                    print_error(f"Failed to fetch tt-metal: {stderr}")
+                    return False
 
-            # Build tt-metal
-            print_info("\n🔨 Building tt-metal (this may take 5-10 minutes)...")
-            result = subprocess.run(
-                ['./build_metal.sh'],
-                cwd=metal_path,
-                capture_output=True,
-                text=True,
-                timeout=1900  # 15 minute timeout for build
-            )
-            if result.returncode != 0:
-                print_error(f"Build failed! Cleaning build directory and retrying...")
-                # Clean build directory
-                import shutil
-                build_dir = metal_path / 'build'
-                if build_dir.exists():
-                    print_info(f"Removing {build_dir}")
-                    shutil.rmtree(build_dir, ignore_errors=True)
-
-                # Retry build
-                print_info("Retrying build...")
-                result = subprocess.run(
-                    ['./build_metal.sh'],
-                    cwd=metal_path,
-                    capture_output=True,
-                    text=True,
-                    timeout=1900
-                )
-                if result.returncode != 0:
-                    print_error(f"Build failed after retry: {result.stderr[-500:]}")  # Last 500 chars
+                # Checkout specific commit
+                returncode, stderr = _run(['git', 'checkout', metal_commit], metal_path, 30)
+                if returncode != 0:
+                    print_error(f"Failed to checkout tt-metal commit {metal_commit}: {stderr}")
                     return False
 
-            print_success("✓ tt-metal built successfully")
+                # Update submodules, only those the checkout left uninitialized or out of sync
+                stale = _stale_submodules(metal_path)
+                if stale is None or stale:
+                    print_info("Updating git submodules...")
+                    returncode, stderr = _run(['git', 'submodule', 'update', '--init', '--recursive',
+                                               '--', *(stale or ())],
+                                              metal_path, 1500)  # 5 minutes for submodules
+                    if returncode != 0:
+                        print_warning(f"Submodule update had issues (continuing anyway): {stderr[:200]}")
+                else:
+                    print_info("Git submodules already up to date")
+
+                print_success(f"✓ tt-metal checked out to {metal_commit}")
+
+                # Build tt-metal (compute-bound, stays serial)
+                print_info("\n🔨 Building tt-metal (this may take 5-10 minutes)...")
+                returncode, stderr = _run_streamed(['./build_metal.sh'], metal_path, 1900)  # 15 minute timeout for build
+                if returncode != 0:
+                    print_error(f"Build failed! Cleaning build directory and retrying...")
+                    # Clean build directory
+                    import shutil
+                    build_dir = metal_path / 'build'
+                    if build_dir.exists():
+                        print_info(f"Removing {build_dir}")
+                        shutil.rmtree(build_dir, ignore_errors=True)
+
+                    # Retry build
+                    print_info("Retrying build...")
+                    returncode, stderr = _run_streamed(['./build_metal.sh'], metal_path, 1900)
+                    if returncode != 0:
+                        print_error(f"Build failed after retry: {stderr[-500:]}")  # Last 500 chars
+                        return False
+
+                print_success("✓ tt-metal built successfully")
 
-        else:
-            print_success(f"✓ tt-metal already on correct commit ({metal_commit})")
+            else:
+                print_success(f"✓ tt-metal already on correct commit ({metal_commit})")
 
-        # === VLLM CHECKOUT ===
-        if not commits_match(current_vllm_commit, vllm_commit):
-            print_info("\n📦 Checking out tt-vllm...")
+            # === VLLM CHECKOUT ===
+            if vllm_needed:
+                print_info("\n📦 Checking out tt-vllm...")
 
-            # Fetch latest
-            result = subprocess.run(
-                ['git', 'fetch', 'origin'],
-                cwd=vllm_path,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-            if result.returncode != 0:
-                print_error(f"Failed to fetch tt-vllm: {result.stderr}")
-                return False
+                returncode, stderr = vllm_fetch.result()
+                if returncode != 0:
+                    print_error(f"Failed to fetch tt-vllm: {stderr}")
+                    return False
 
-            # Checkout specific commit
-            result = subprocess.run(
-                ['git', 'checkout', vllm_commit],
-                cwd=vllm_path,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            if result.returncode != 0:
-                print_error(f"Failed to checkout tt-vllm commit {vllm_commit}: {result.stderr}")
-                return False
+                # Checkout specific commit
+                returncode, stderr = _run(['git', 'checkout', vllm_commit], vllm_path, 30)
+                if returncode != 0:
+                    print_error(f"Failed to checkout tt-vllm commit {vllm_commit}: {stderr}")
+                    return False
 
-            print_success(f"✓ tt-vllm checked out to {vllm_commit}")
+                print_success(f"✓ tt-vllm checked out to {vllm_commit}")
 
-        else:
-            print_success(f"✓ tt-vllm already on correct commit ({vllm_commit})")
+            else:
+                print_success(f"✓ tt-vllm already on correct commit ({vllm_commit})")
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
 
-        # === MODEL DOWNLOAD ===
-        if not model_exists and hf_repo:
+        # === MODEL DOWNLOAD (only once both checkouts have succeeded) ===
+        if download_needed:
             print_info("\n📥 Downloading model from HuggingFace...")
 
             # Check HF authentication
             if 'HF_TOKEN' not in os.environ:
                 # Check if logged in via huggingface-cli
-                result = subprocess.run(
-                    ['huggingface-cli', 'whoami'],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                if result.returncode != 0:
+                if not _hf_logged_in():
                     print_error("❌ Not logged into HuggingFace!")
                     print_info("")
                     print_info("Please either:")
@@ -1104,14 +1694,9 @@ def execute_setup(spec: Dict, model_info: Dict, metal_info: Optional[Dict],
                     return False
 
             # Download model
-            result = subprocess.run(
-                ['huggingface-cli', 'download', hf_repo, '--local-dir', str(model_path)],
-                capture_output=True,
-                text=True,
-                timeout=1800  # 30 minute timeout for download
-            )
-            if result.returncode != 0:
-                print_error(f"Failed to download model: {result.stderr}")
+            returncode, stderr = _download_model(hf_repo, str(model_path))
+            if returncode != 0:
+                print_error(f"Failed to download model: {stderr}")
                 return False
 
             print_success("✓ Model downloaded successfully")
@@ -1140,6 +1725,22 @@ def execute_setup(spec: Dict, model_info: Dict, metal_info: Optional[Dict],
         return False
 
 
+# Use start script from tt-jukebox directory
+_START_SCRIPT = Path(__file__).parent / 'start-vllm-server.py'
+
+# vLLM run command, filled by format_cli_command()
+_RUN_TEMPLATE = """# Start vLLM server with {model_name} on {device_type}
+cd ~/tt-vllm && \\
+  source ~/tt-vllm-venv/bin/activate && \\
+  {env_vars} && \\
+  source ~/tt-vllm/tt_metal/setup-metal.sh && \\
+  python {script} \\
+    {flags}
+
+# Note: First model load takes 2-5 minutes
+# Server will be available at http://localhost:8000"""
+
+
 def format_cli_command(spec: Dict, model_info: Dict) -> Dict[str, str]:
     """
     Generate ready-to-run CLI commands for starting vLLM with the given model.
@@ -1171,11 +1772,15 @@ def format_cli_command(spec: Dict, model_info: Dict) -> Dict[str, str]:
 
     # === RUN COMMAND (Explicit and copy-pasteable) ===
     # Build environment variables
-    env_vars = f"export TT_METAL_HOME=~/tt-metal && export MESH_DEVICE={device_type} && export PYTHONPATH=$TT_METAL_HOME:$PYTHONPATH"
+    env_parts = [
+        "export TT_METAL_HOME=~/tt-metal",
+        f"export MESH_DEVICE={device_type}",
+        "export PYTHONPATH=$TT_METAL_HOME:$PYTHONPATH",
+    ]
 
     # Add architecture name for Blackhole devices
-    if 'P' in device_type.upper():  # P100, P150, etc.
-        env_vars += " && export TT_METAL_ARCH_NAME=blackhole"
+    if _ARCH_BY_DEVICE.get(device_type.upper()) == 'blackhole':  # P100, P150, etc.
+        env_parts.append("export TT_METAL_ARCH_NAME=blackhole")
 
     # Build vLLM command
     vllm_flags = [
@@ -1190,25 +1795,14 @@ def format_cli_command(spec: Dict, model_info: Dict) -> Dict[str, str]:
     if tensor_parallel and tensor_parallel > 1:
         vllm_flags.append(f"--tensor-parallel-size {tensor_parallel}")
 
-    # Join flags with line continuation
-    flag_separator = ' \\\n    '
-    vllm_flags_str = flag_separator.join(vllm_flags)
-
-    # Use start script from tt-jukebox directory
-    script_path = Path(__file__).parent / 'start-vllm-server.py'
-
-    vllm_command = f"""cd ~/tt-vllm && \\
-  source ~/tt-vllm-venv/bin/activate && \\
-  {env_vars} && \\
-  source ~/tt-vllm/tt_metal/setup-metal.sh && \\
-  python {script_path} \\
-    {vllm_flags_str}"""
-
-    commands['run'] = f"""# Start vLLM server with {model_name} on {device_type}
-{vllm_command}
-
-# Note: First model load takes 2-5 minutes
-# Server will be available at http://localhost:8000"""
+    commands['run'] = _RUN_TEMPLATE.format_map({
+        'model_name': model_name,
+        'device_type': device_type,
+        'env_vars': ' && '.join(env_parts),
+        'script': _START_SCRIPT,
+        # Join flags with line continuation
+        'flags': ' \\\n    '.join(vllm_flags),
+    })
 
     # === TEST COMMAND ===
     commands['test'] = f"""# Test vLLM server
@@ -1257,11 +1851,42 @@ def display_cli_commands(commands: Dict[str, str], spec: Dict):
 # Main Functions
 # ============================================================================
 
-def list_compatible_models(specs: List[Dict], hardware: str, show_experimental: bool = False):
-    """List all models compatible with the detected hardware."""
+# Fixed list/selection text, with the ANSI codes interpolated once at import
+_HDR_VALIDATED = f"\n{Colors.OKGREEN}{Colors.BOLD}✓ VALIDATED MODELS{Colors.ENDC}"
+_HDR_EXPERIMENTAL = (
+    f"\n{Colors.WARNING}{Colors.BOLD}⚠ EXPERIMENTAL MODELS (not validated){Colors.ENDC}\n"
+    f"{Colors.WARNING}These models may work but will use conservative parameters (33% reduction){Colors.ENDC}"
+)
+_FAMILY_FMT = f"\n{Colors.BOLD}{{}} Family:{Colors.ENDC}"
+_TOTAL_VALIDATED_FMT = f"\n{Colors.BOLD}Total validated: {{}} models{Colors.ENDC}"
+_TOTAL_EXPERIMENTAL_FMT = (
+    f"\n{Colors.BOLD}Total experimental: {{}} models{Colors.ENDC}\n"
+    f"{Colors.WARNING}Use --show-experimental with model search to try these{Colors.ENDC}"
+)
+_SELECT_PROMPT_FMT = f"\n{Colors.BOLD}Select a configuration (1-{{}}) or 'q' to quit:{Colors.ENDC} "
+
+
+def _group_by_family(specs: List[Dict]) -> List[Tuple[str, List[Dict]]]:
+    """Group specs by model family (name up to the first '-'), sorted by family."""
+    families = collections.defaultdict(list)
+    for spec in specs:
+        families[spec.get('model_name', 'Unknown').partition('-')[0]].append(spec)
+    # Compare family names only; ties never fall through to the model lists
+    return sorted(families.items(), key=itemgetter(0))
+
+
+def list_compatible_models(specs: List[Dict], hardware: str, show_experimental: bool = False,
+                           filtered: Optional[Tuple[List[Dict], List[Dict]]] = None):
+    """
+    List all models compatible with the detected hardware.
+    filtered is a filter_by_hardware(specs, hardware, show_experimental) result
+    the caller already has; it is computed here when omitted.
+    """
     print_header(f"Models Compatible with {hardware}")
 
-    validated, experimental = filter_by_hardware(specs, hardware, show_experimental)
+    if filtered is None:
+        filtered = filter_by_hardware(specs, hardware, show_experimental)
+    validated, experimental = filtered
 
     if not validated and not experimental:
         print_warning(f"No models found for {hardware} in the specifications database")
@@ -1271,77 +1896,49 @@ def list_compatible_models(specs: List[Dict], hardware: str, show_experimental:
         print_info("  3. Try using 'latest main' branches for tt-metal and vLLM")
         return
 
+    # Collect the listing and write it once rather than one print() per line
+    parts = []
+    add = parts.append
+
     # Display validated models
     if validated:
-        print(f"\n{Colors.OKGREEN}{Colors.BOLD}✓ VALIDATED MODELS{Colors.ENDC}")
-        families = {}
-        for spec in validated:
-            model_name = spec.get('model_name', 'Unknown')
-            family = model_name.split('-')[0] if '-' in model_name else model_name
-            if family not in families:
-                families[family] = []
-            families[family].append(spec)
-
-        for family, models in sorted(families.items()):
-            print(f"\n{Colors.BOLD}{family} Family:{Colors.ENDC}")
+        add(_HDR_VALIDATED)
+        for family, models in _group_by_family(validated):
+            add(_FAMILY_FMT.format(family))
             for spec in models:
-                status = spec.get('status', 'UNKNOWN').upper()
-                status_badge = ''
-                if status == 'EXPERIMENTAL':
-                    status_badge = f' [{Colors.WARNING}EXPERIMENTAL{Colors.ENDC}]'
-                elif status == 'FUNCTIONAL':
-                    status_badge = f' [{Colors.OKCYAN}FUNCTIONAL{Colors.ENDC}]'
-                elif status == 'COMPLETE':
-                    status_badge = f' [{Colors.OKGREEN}COMPLETE{Colors.ENDC}]'
-
-                print(f"  • {spec.get('model_name', 'Unknown')}{status_badge}")
-                # Get max context from nested device_model_spec
-                max_context = 'N/A'
-                if 'device_model_spec' in spec and 'max_context' in spec['device_model_spec']:
-                    max_context = spec['device_model_spec']['max_context']
-                print(f"    Context: {max_context} tokens, "
-                      f"Disk: {spec.get('min_disk_gb', 'N/A')} GB")
-
-        print(f"\n{Colors.BOLD}Total validated: {len(validated)} models{Colors.ENDC}")
+                status_badge = _STATUS_BADGE.get(_spec_status(spec), '')
+
+                add(f"  • {spec.get('model_name', 'Unknown')}{status_badge}")
+                add(f"    Context: {_max_context(spec)} tokens, "
+                    f"Disk: {spec.get('min_disk_gb', 'N/A')} GB")
+
+        add(_TOTAL_VALIDATED_FMT.format(len(validated)))
 
     # Display experimental models if requested
     if show_experimental and experimental:
-        print(f"\n{Colors.WARNING}{Colors.BOLD}⚠ EXPERIMENTAL MODELS (not validated){Colors.ENDC}")
-        print(f"{Colors.WARNING}These models may work but will use conservative parameters (33% reduction){Colors.ENDC}")
-
-        families = {}
-        for spec in experimental:
-            model_name = spec.get('model_name', 'Unknown')
-            family = model_name.split('-')[0] if '-' in model_name else model_name
-            if family not in families:
-                families[family] = []
-            families[family].append(spec)
-
-        for family, models in sorted(families.items()):
-            print(f"\n{Colors.BOLD}{family} Family:{Colors.ENDC}")
+        add(_HDR_EXPERIMENTAL)
+
+        for family, models in _group_by_family(experimental):
+            add(_FAMILY_FMT.format(family))
             for spec in models:
                 device_type = spec.get('device_type', 'Unknown')
-                status = spec.get('status', 'UNKNOWN').upper()
-                compatibility = spec.get('_compatibility_reason', '')
+                compatibility = _compatibility_reason(spec)
 
-                status_badge = ''
-                if status == 'EXPERIMENTAL':
-                    status_badge = f' [{Colors.WARNING}EXPERIMENTAL{Colors.ENDC}]'
+                # Only the EXPERIMENTAL badge is shown for unvalidated models
+                status_badge = _STATUS_BADGE['EXPERIMENTAL'] if _spec_status(spec) == 'EXPERIMENTAL' else ''
 
-                print(f"  • {spec.get('model_name', 'Unknown')} (validated for {device_type}){status_badge}")
+                add(f"  • {spec.get('model_name', 'Unknown')} (validated for {device_type}){status_badge}")
 
                 if compatibility:
-                    print(f"    {Colors.WARNING}Reason: {compatibility}{Colors.ENDC}")
+                    add(f"    {Colors.WARNING}Reason: {compatibility}{Colors.ENDC}")
+
+                add(f"    Context: {_max_context(spec)} tokens, "
+                    f"Disk: {spec.get('min_disk_gb', 'N/A')} GB")
 
-                # Get max context from nested device_model_spec
-                max_context = 'N/A'
-                if 'device_model_spec' in spec and 'max_context' in spec['device_model_spec']:
-                    max_context = spec['device_model_spec']['max_context']
-                print(f"    Context: {max_context} tokens, "
-                      f"Disk: {spec.get('min_disk_gb', 'N/A')} GB")
+        add(_TOTAL_EXPERIMENTAL_FMT.format(len(experimental)))
 
-        print(f"\n{Colors.BOLD}Total experimental: {len(experimental)} models{Colors.ENDC}")
-        print(f"{Colors.WARNING}Use --show-experimental with model search to try these{Colors.ENDC}")
+    if parts:
+        sys.stdout.write('\n'.join(parts) + '\n')
 
 
 def interactive_selection(matches: List[Dict], metal_info: Optional[Dict],
@@ -1353,18 +1950,19 @@ def interactive_selection(matches: List[Dict], metal_info: Optional[Dict],
 
     print_header("Matching Configurations")
 
-    # Display all matches with environment compatibility
-    for i, spec in enumerate(matches, 1):
-        env_match = check_environment_match(spec, metal_info, vllm_info)
-        is_experimental = spec.get('_is_experimental', False)
-        display_model_spec(spec, i, env_match, is_experimental)
+    # Display all matches with environment compatibility, in one write
+    sys.stdout.write(''.join(
+        _format_model_spec(spec, i, check_environment_match(spec, metal_info, vllm_info),
+                           spec.get('_is_experimental', False))
+        for i, spec in enumerate(matches, 1)
+    ))
 
     # Prompt for selection
-    print(f"\n{Colors.BOLD}Select a configuration (1-{len(matches)}) or 'q' to quit:{Colors.ENDC} ", end='')
+    sys.stdout.write(_SELECT_PROMPT_FMT.format(len(matches)))
 
     try:
         # Check if we're in a TTY (interactive terminal)
-        if not sys.stdin.isatty():
+        if not _STDIN_IS_TTY:
             print_warning("\nNon-interactive mode detected. Auto-selecting first match.")
             print_info(f"Selected: {matches[0].get('model_name', 'Unknown')}")
             return matches[0]
@@ -1417,28 +2015,47 @@ Examples:
     parser.add_argument('--show-experimental', '-e', action='store_true',
                        help='Include experimental/unvalidated models that might work on your hardware')
     parser.add_argument('--refresh-cache', action='store_true',
-                       help='Force refresh of cached model specifications (bypasses 1-hour cache)')
+                       help='Force refresh of cached model specs and hardware/environment detection')
 
     args = parser.parse_args()
 
+    # Nothing to do: stop before any hardware/environment probing
+    # (--refresh-cache alone still refreshes the caches)
+    if not (args.list or args.task or args.model or args.refresh_cache):
+        print_error("Please specify either a task or --model")
+        parser.print_help()
+        return 1
+
     # Set HF_TOKEN from argument if provided
     if args.hf_token:
-        import os
         os.environ['HF_TOKEN'] = args.hf_token
         print_info('Using HF_TOKEN from command line argument')
 
     # Banner
     print_header("🎵 TT-Jukebox: Model & Environment Manager")
     print_info(f"📝 Log file: {LOG_FILE}")
-    logger.info(f"Starting tt-jukebox v1.0.0")
-    logger.info(f"Command: {' '.join(sys.argv)}")
+    logger.info("Starting tt-jukebox v1.0.0")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Command: %s", shlex.join(sys.argv))
 
     # Detect environment
-    hardware = detect_hardware()
-    firmware = get_firmware_version()
-    metal_info = detect_tt_metal()
-    vllm_info = detect_tt_vllm()
-    python_ver, python_ok = check_python_version()
+    if args.refresh_cache:
+        refresh_hardware()
+    # The read-only probes are independent subprocess calls, so run them
+    # concurrently. Hardware and firmware share one worker because both parse
+    # the same tt-smi output. A missing tt-metal/tt-vllm checkout makes its
+    # detect_* clone it, so those run afterwards, one at a time.
+    metal_present = _first_git_repo(_tt_metal_paths()) is not None
+    vllm_present = _first_git_repo(_tt_vllm_paths()) is not None
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        hw_future = executor.submit(lambda: (detect_hardware(), get_firmware_version()))
+        metal_future = executor.submit(detect_tt_metal) if metal_present else None
+        vllm_future = executor.submit(detect_tt_vllm) if vllm_present else None
+        python_future = executor.submit(check_python_version)
+    hardware, firmware = hw_future.result()
+    python_ver, python_ok = python_future.result()
+    metal_info = metal_future.result() if metal_future else detect_tt_metal()
+    vllm_info = vllm_future.result() if vllm_future else detect_tt_vllm()
 
     # Display current environment
     display_current_environment(hardware, firmware, metal_info, vllm_info,
@@ -1457,14 +2074,15 @@ Examples:
         print_error("\nCannot proceed without model specifications")
         return 1
 
+    # Filter by hardware once, for both --list and matching
+    validated_specs, experimental_specs = filter_by_hardware(specs, hardware, args.show_experimental)
+
     # Handle --list
     if args.list:
-        list_compatible_models(specs, hardware, args.show_experimental)
+        list_compatible_models(specs, hardware, args.show_experimental,
+                               filtered=(validated_specs, experimental_specs))
         return 0
 
-    # Filter by hardware first
-    validated_specs, experimental_specs = filter_by_hardware(specs, hardware, args.show_experimental)
-
     if not validated_specs and not experimental_specs:
         print_warning(f"\nNo models cataloged for {hardware} in the database")
         print_info("Note: Many models work but aren't in the official table yet")
@@ -1527,7 +2145,7 @@ Examples:
         if not args.force:
             try:
                 # Check if we're in a TTY (interactive terminal)
-                if not sys.stdin.isatty():
+                if not _STDIN_IS_TTY:
                     print_warning("Non-interactive mode detected. Use --force to auto-confirm.")
                     print_warning("Setup cancelled - run with --force flag to skip confirmation")
                     return 0
@@ -1543,6 +2161,9 @@ Examples:
 
         success = execute_setup(selected, model_info, metal_info, vllm_info)
 
+        # Setup may have checked out different commits
+        refresh_hardware()
+
         if not success:
             print_error("\n❌ Setup failed - see errors above")
             return 1